@@ -1,36 +1,37 @@
-<<<<<<< HEAD
-# Databases/user_data.py
-=======
 # Databases/gpa.py
->>>>>>> jiaxian
-import sqlite3
+import os
+import sys
+
+# Allow running as `python Databases/gpa.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import TRACKADEMIC_DB, connect
+from migrations import MIGRATIONS, migrate
 
 def create_gpa_database():
     """Create and populate a SQLite database for Trackademic"""
     
-    conn = sqlite3.connect('trackademic.db')
+    conn = connect(TRACKADEMIC_DB)
+    migrate(conn, MIGRATIONS[TRACKADEMIC_DB])
     cursor = conn.cursor()
     
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS gpa (
-        trimester_id INTEGER PRIMARY KEY,
-        trimester TEXT NOT NULL UNIQUE,
-        gpa REAL NOT NULL CHECK (gpa >= 0.0 AND gpa <= 4.0)
-    )
-    ''')
+    # GPA rows belong to a user, so sample data goes to the admin account
+    admin = cursor.execute(
+        "SELECT user_id FROM trackademic_users WHERE email = 'admin@login.com'"
+    ).fetchone()
+    if not admin:
+        print("Admin user not found; start the app once to create it.")
+        conn.close()
+        return
     
     gpa = [
-        ('Trimester 2510', '3.73'),
+        (admin['user_id'], 'Trimester 2510', 3.73, 0, 0.0),
     ]
     
     cursor.executemany(
-<<<<<<< HEAD
-        '''INSERT OR IGNORE INTO gpa 
-=======
         '''INSERT OR IGNORE INTO gpa
->>>>>>> jiaxian
-        (trimester, gpa) 
-        VALUES (?, ?)''',
+        (user_id, trimester, gpa, total_credits, total_grade_points) 
+        VALUES (?, ?, ?, ?, ?)''',
         gpa
     )
 
@@ -40,4 +41,4 @@ def create_gpa_database():
     conn.close()
 
 if __name__ == "__main__":
-    create_gpa_database()
\ No newline at end of file
+    create_gpa_database()
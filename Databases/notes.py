@@ -1,64 +1,33 @@
 # Databases/notes.py
+import os
 import sqlite3
+import sys
+
+# Allow running as `python Databases/notes.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import TRACKADEMIC_DB, connect
+from migrations import MIGRATIONS, migrate
 
 def create_notes_database():
     """Create and populate a SQLite database for Trackademic"""
     
-    conn = sqlite3.connect('trackademic.db')
+    conn = connect(TRACKADEMIC_DB)
+    migrate(conn, MIGRATIONS[TRACKADEMIC_DB])
     cursor = conn.cursor()
     
-<<<<<<< HEAD
-=======
-    # Enable foreign key constraints
-    cursor.execute("PRAGMA foreign_keys = ON")
-    
->>>>>>> jiaxian
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS notes (
-        note_id INTEGER PRIMARY KEY,
-        subject_id INTEGER NOT NULL,
-        user_id INTEGER NOT NULL,
-        file_name TEXT NOT NULL,
-<<<<<<< HEAD
-        file BLOB
-    )
-    ''')
-    
-    notes = [
-        ('GNB1114', '1', 'trackademic.pdf', 'Databases'),
-    ]
-    
-    cursor.executemany(
-        '''INSERT OR IGNORE INTO notes
-        (subject_id, user_id, file_name, file)
-        VALUES (?, ?, ?, ?)''',
-        notes
-    )
-
-    conn.commit()
-    print("Notes Database created successfully!")
-    
-    conn.close()
-=======
-        file BLOB,
-        FOREIGN KEY (subject_id) REFERENCES subjects(subject_id)
-            ON DELETE CASCADE
-            ON UPDATE CASCADE
-    )
-    ''')
-    
     # Fixed notes data - proper tuple structure
     notes = [
-        (1, 1, 'business_notes.pdf', None),  # subject_id, user_id, file_name, file
-        (2, 1, 'computing_notes.pdf', None),
-        (3, 1, 'english_notes.pdf', None),
+        (1, 1, 'business_notes.pdf'),  # subject_id, user_id, file_name
+        (2, 1, 'computing_notes.pdf'),
+        (3, 1, 'english_notes.pdf'),
     ]
     
     try:
         cursor.executemany(
             '''INSERT OR IGNORE INTO notes
-            (subject_id, user_id, file_name, file) 
-            VALUES (?, ?, ?, ?)''',
+            (subject_id, user_id, file_name) 
+            VALUES (?, ?, ?)''',
             notes
         )
         conn.commit()
@@ -71,7 +40,6 @@ def create_notes_database():
         conn.rollback()
     finally:
         conn.close()
->>>>>>> jiaxian
 
 if __name__ == "__main__":
-    create_notes_database()
\ No newline at end of file
+    create_notes_database()
@@ -1,21 +1,20 @@
 # Databases/subjects.py
-import sqlite3
+import os
+import sys
+
+# Allow running as `python Databases/subjects.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import TRACKADEMIC_DB, connect
+from migrations import MIGRATIONS, migrate
 
 def create_subjects_database():
     """Create and populate a SQLite database for Trackademic"""
     
-    conn = sqlite3.connect('trackademic.db')
+    conn = connect(TRACKADEMIC_DB)
+    migrate(conn, MIGRATIONS[TRACKADEMIC_DB])
     cursor = conn.cursor()
     
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS subjects (
-        subject_id INTEGER PRIMARY KEY,
-        subject_name TEXT NOT NULL UNIQUE,
-        subject_code TEXT UNIQUE,
-        credit_hours INTEGER DEFAULT 3
-    )
-    ''')
-    
     subjects = [
         ('Introduction to Business Management', 'GNB1114', 4),
         ('Introduction to Computing Technologies', 'CCT1114', 4),
@@ -46,4 +45,4 @@ def create_subjects_database():
     conn.close()
 
 if __name__ == "__main__":
-    create_subjects_database()
\ No newline at end of file
+    create_subjects_database()
@@ -1,27 +1,26 @@
 # Databases/user_data.py
-import sqlite3
+import os
+import sys
+
+# Allow running as `python Databases/user_data.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import TRACKADEMIC_DB, connect
+from migrations import MIGRATIONS, migrate
 
 def create_user_database():
     """Create and populate a SQLite database for Trackademic"""
     
-    conn = sqlite3.connect('trackademic.db')
+    conn = connect(TRACKADEMIC_DB)
+    migrate(conn, MIGRATIONS[TRACKADEMIC_DB])
     cursor = conn.cursor()
     
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS user_data (
-        user_id INTEGER PRIMARY KEY,
-        username TEXT NOT NULL UNIQUE,
-        email TEXT NOT NULL UNIQUE,
-        password TEXT NOT NULL
-    )
-    ''')
-    
     user_data = [
         ('jiaxian0331', 'hoejiaxian@gmail.com', 'jiaxian0000'),
     ]
     
     cursor.executemany(
-        '''INSERT OR IGNORE INTO user_data 
+        '''INSERT OR IGNORE INTO trackademic_users 
         (username, email, password) 
         VALUES (?, ?, ?)''',
         user_data
@@ -33,4 +32,4 @@ def create_user_database():
     conn.close()
 
 if __name__ == "__main__":
-    create_user_database()
\ No newline at end of file
+    create_user_database()
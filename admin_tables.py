@@ -0,0 +1,94 @@
+"""Paged, sortable admin tables streamed straight from a cursor.
+
+A view describes its query and the columns it may be sorted by; TablePage
+reads ``page``, ``per_page``, ``sort`` and ``order`` from the query string
+and runs one LIMIT/OFFSET query. The rows are handed to the
+``admin_table.html`` template as a generator that is consumed while the
+response streams, so a page never holds more than one row at a time.
+"""
+from flask import Response, request, stream_template, url_for
+
+PER_PAGE = 50
+MAX_PER_PAGE = 500
+
+
+class TablePage:
+    """One page of an admin table: paging and sort state plus the row stream.
+
+    sort_columns maps each sort key offered in the query string to the SQL
+    expressions it orders by; unknown keys fall back to default_sort, so
+    only whitelisted expressions ever reach the ORDER BY. The last
+    expressions should make the order unique, or rows can shift between
+    pages.
+    """
+
+    def __init__(self, sort_columns, default_sort):
+        self.sort_columns = sort_columns
+        sort = request.args.get('sort')
+        self.sort = sort if sort in sort_columns else default_sort
+        self.descending = request.args.get('order') == 'desc'
+        self.page = max(1, request.args.get('page', 1, type=int))
+        self.per_page = min(max(1, request.args.get('per_page', PER_PAGE, type=int)), MAX_PER_PAGE)
+        self.has_next = False
+
+    @property
+    def order_by(self):
+        direction = 'DESC' if self.descending else 'ASC'
+        return ', '.join(f'{column} {direction}' for column in self.sort_columns[self.sort])
+
+    def rows(self, conn, sql, params=()):
+        """Run sql (without ORDER BY or LIMIT) for this page and return a generator over its rows.
+
+        The query runs now, so errors surface in the view; the generator
+        closes conn once the rows have been streamed.
+        """
+        try:
+            cursor = conn.execute(
+                f'{sql} ORDER BY {self.order_by} LIMIT ? OFFSET ?',
+                (*params, self.per_page + 1, (self.page - 1) * self.per_page)
+            )
+        except Exception:
+            conn.close()
+            raise
+        return self._stream(conn, cursor)
+
+    def _stream(self, conn, cursor):
+        try:
+            # One extra row is fetched to learn whether there is a next page
+            for count, row in enumerate(cursor):
+                if count == self.per_page:
+                    self.has_next = True
+                    break
+                yield row
+        finally:
+            conn.close()
+
+    def url(self, **changes):
+        """Link to this table with some of page/per_page/sort/order changed"""
+        args = {
+            'page': self.page,
+            'per_page': self.per_page,
+            'sort': self.sort,
+            'order': 'desc' if self.descending else 'asc',
+        }
+        args.update(changes)
+        return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+    def sort_url(self, sort):
+        """Link that sorts by `sort`, flipping the direction if it is already the sort key"""
+        descending = not self.descending if sort == self.sort else False
+        return self.url(sort=sort, order='desc' if descending else 'asc', page=1)
+
+
+def stream_table(title, sections, footer_links=()):
+    """Stream admin_table.html for one or more table sections.
+
+    Each section is a dict with ``columns`` (label, sort key or None),
+    ``rows`` (an iterable of (cells, actions), actions being (label, href,
+    confirm message or None)) and optionally ``heading``, ``page``,
+    ``before`` (a paragraph shown above the table), ``links`` and
+    ``empty``/``empty_link`` for when there are no rows.
+    """
+    return Response(stream_template(
+        'admin_table.html', title=title, sections=sections, footer_links=footer_links
+    ))
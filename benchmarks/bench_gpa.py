@@ -0,0 +1,96 @@
+"""Compare per-dict GPA/CGPA loops with the batch engine on a synthetic cohort.
+
+The loop path calls calculate_gpa_server() for every student-trimester and
+calculate_cgpa_server() for every student, the way the calculator does for
+one user. The batch path gets the same grades as flat arrays (the shape a
+cohort query returns) and computes every GPA and CGPA with gpa_engine,
+with NumPy when available and with the array.array fallback.
+
+Run from the repository root:
+
+    python benchmarks/bench_gpa.py [--students 5000] [--trimesters 6] [--subjects 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blueprints.calculator import calculate_cgpa_server, calculate_gpa_server
+from gpa_engine import GRADE_CODES, load_numpy, batch_cgpa, batch_gpa, encode_grades
+
+np = load_numpy()
+
+
+def make_cohort(students, trimesters, subjects):
+    """Per student, a list of trimesters, each a list of calculator-style subject dicts"""
+    grades = GRADE_CODES + ('',)
+    return [
+        [
+            [{'grade': random.choice(grades), 'credits': random.choice((3, 4))} for _ in range(subjects)]
+            for _ in range(trimesters)
+        ]
+        for _ in range(students)
+    ]
+
+
+def loop_path(cohort):
+    cgpas = []
+    for student in cohort:
+        history = [calculate_gpa_server(trimester) for trimester in student]
+        cgpas.append(calculate_cgpa_server(history))
+    return cgpas
+
+
+def flatten(cohort):
+    """Parallel arrays as a cohort query would return them: one entry per subject, per trimester"""
+    groups, grades, credits = [], [], []
+    trimester_students = []
+    for student_index, student in enumerate(cohort):
+        for trimester in student:
+            group = len(trimester_students)
+            trimester_students.append(student_index)
+            for subject in trimester:
+                groups.append(group)
+                grades.append(subject['grade'])
+                credits.append(subject['credits'])
+    return groups, encode_grades(grades), credits, trimester_students
+
+
+def batch_path(flat, n_students, vectorized):
+    groups, grades, credits, trimester_students = flat
+    trimester_credits, trimester_points, _ = batch_gpa(
+        groups, grades, credits, len(trimester_students), vectorized=vectorized)
+    return batch_cgpa(trimester_students, trimester_credits, trimester_points, n_students,
+                      vectorized=vectorized)[2]
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f'{label:>16}: {(time.perf_counter() - start) * 1000:8.1f} ms')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=5000)
+    parser.add_argument('--trimesters', type=int, default=6)
+    parser.add_argument('--subjects', type=int, default=5)
+    args = parser.parse_args()
+
+    cohort = make_cohort(args.students, args.trimesters, args.subjects)
+    expected = timed('per-dict loop', loop_path, cohort)
+    flat = flatten(cohort)
+    backends = [('batch (array)', False, flat)]
+    if np is not None:
+        backends.append(('batch (numpy)', True, tuple(np.asarray(column) for column in flat)))
+    for label, vectorized, columns in backends:
+        cgpas = timed(label, batch_path, columns, len(cohort), vectorized)
+        assert all(abs(a - b) < 1e-9 for a, b in zip(expected, cgpas))
+
+
+if __name__ == '__main__':
+    main()
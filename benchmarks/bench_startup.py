@@ -0,0 +1,149 @@
+"""Measure worker cold-start time before and after the startup schema check.
+
+Each run imports app.py in a fresh interpreter, the way a gunicorn worker
+does, inside a throwaway copy of the project so the real databases are not
+touched. The "before" tree is exported from git at the commit just before
+ensure_databases_current() was introduced, when importing app.py ran
+init_databases() unconditionally; the "after" tree is the working tree (or
+--after REV). Both get copies of the same databases.
+
+Bytecode caching is left on (and warmed by a first import), as on a
+deployed worker; with PYTHONDONTWRITEBYTECODE set every run would compile
+each module from source. Runs alternate between the trees so drift on the
+machine hits both. Besides the wall time of the whole process, each run
+reports how long ``import app`` itself took once Flask was loaded, which
+is the part this project controls.
+
+The startup database step is also timed on its own, in one process of the
+"after" tree: init_databases() (what every import used to run) against
+ensure_databases_current() on databases that are already current.
+
+--blueprints sets TRACKADEMIC_BLUEPRINTS for the runs, to time a worker
+that serves only some subsystems (trees from before the split ignore it).
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py [--runs 20] [--before REV] [--after REV] [--blueprints auth,social]
+"""
+import argparse
+import glob
+import io
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IGNORE = shutil.ignore_patterns('.git', '__pycache__', 'static', 'benchmarks')
+
+
+def git(*args):
+    return subprocess.run(['git', *args], cwd=ROOT, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def default_before():
+    """Parent of the commit that stopped running init_databases() on every import"""
+    commits = git('log', '--reverse', '--format=%H', '-S', 'ensure_databases_current', '--', 'app.py').split()
+    return f'{commits[0]}^'
+
+
+def export_tree(rev, workdir):
+    """Copy the project at rev (or the working tree if rev is None) plus the current databases"""
+    if rev is None:
+        shutil.copytree(ROOT, workdir, ignore=IGNORE)
+    else:
+        archive = subprocess.run(['git', 'archive', '--format=tar', rev], cwd=ROOT,
+                                 check=True, capture_output=True).stdout
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(workdir)
+        for database in glob.glob(os.path.join(ROOT, '*.db')):
+            shutil.copy(database, workdir)
+    os.makedirs(os.path.join(workdir, 'static', 'uploads'), exist_ok=True)
+
+
+IMPORT_APP = """
+import time
+import click, flask, flask.cli
+start = time.perf_counter()
+import app
+print(time.perf_counter() - start)
+"""
+
+DATABASE_STEP = """
+import statistics, time
+import app
+for step in (app.init_databases, app.ensure_databases_current):
+    timings = []
+    for _ in range({runs}):
+        start = time.perf_counter()
+        step()
+        timings.append(time.perf_counter() - start)
+    print(f'{{step.__name__}}(): median {{statistics.median(timings) * 1000:.2f}} ms')
+"""
+
+
+def worker_env(blueprints=None):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    if blueprints:
+        env['TRACKADEMIC_BLUEPRINTS'] = blueprints
+    return env
+
+
+def run_python(workdir, code, blueprints=None):
+    return subprocess.run([sys.executable, '-c', code], cwd=workdir, env=worker_env(blueprints),
+                          check=True, capture_output=True, text=True).stdout
+
+
+def time_import(workdir, blueprints=None):
+    """Return (whole process, import app alone) in seconds for one cold start"""
+    start = time.perf_counter()
+    output = run_python(workdir, IMPORT_APP, blueprints)
+    return time.perf_counter() - start, float(output.split()[-1])
+
+
+def summary(timings):
+    return (f'median {statistics.median(timings) * 1000:7.1f} ms '
+            f'(min {min(timings) * 1000:.1f}, max {max(timings) * 1000:.1f})')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--before', help='git revision of the old startup path (default: found from history)')
+    parser.add_argument('--after', help='git revision to compare (default: the working tree)')
+    parser.add_argument('--blueprints', help='TRACKADEMIC_BLUEPRINTS for the runs (default: all)')
+    args = parser.parse_args()
+    before = args.before or default_before()
+
+    trees = {'before': (before, f'before ({before})'),
+             'after': (args.after, f'after ({args.after or "working tree"})')}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = {}
+        for name, (rev, _) in trees.items():
+            workdir = os.path.join(tmp, name)
+            export_tree(rev, workdir)
+            # First import brings the copied databases up to that tree's schema and writes bytecode
+            run_python(workdir, 'import app')
+            timings[name] = []
+        for _ in range(args.runs):
+            for name in trees:
+                timings[name].append(time_import(os.path.join(tmp, name), args.blueprints))
+
+        print(f'Cold starts, {args.runs} alternating runs per tree'
+              f'{f" (blueprints: {args.blueprints})" if args.blueprints else ""}:')
+        for name, (_, label) in trees.items():
+            print(f'  {label}')
+            print(f'    process:    {summary([run[0] for run in timings[name]])}')
+            print(f'    import app: {summary([run[1] for run in timings[name]])}')
+        print('Startup database step, current databases:')
+        print(run_python(os.path.join(tmp, 'after'), DATABASE_STEP.format(runs=args.runs * 5)), end='')
+
+if __name__ == '__main__':
+    main()
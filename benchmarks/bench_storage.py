@@ -0,0 +1,105 @@
+"""Compare read/write concurrency of the default rollback journal and the WAL configuration.
+
+Run from the repository root:
+
+    python benchmarks/bench_storage.py [--seconds 3] [--readers 4] [--writers 2]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import STORAGE_PRAGMAS, connect
+
+def connect_baseline(path):
+    """A connection as the app opened them before the storage layer: SQLite
+    defaults (rollback journal, synchronous=FULL), a 10 s busy timeout and
+    no retry wrapper"""
+    return sqlite3.connect(path, timeout=10)
+
+
+def connect_tuned(path):
+    return connect(path, STORAGE_PRAGMAS)
+
+
+def setup(path, opener):
+    conn = opener(path)
+    conn.execute('CREATE TABLE posts (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, content TEXT)')
+    conn.executemany('INSERT INTO posts (user_id, content) VALUES (?, ?)',
+                     ((i % 50, f'post {i}') for i in range(2000)))
+    conn.commit()
+    conn.close()
+
+
+def run(opener, seconds, readers, writers):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        setup(path, opener)
+
+        stop = threading.Event()
+        counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+
+        def reader():
+            conn = opener(path)
+            done = errors = 0
+            while not stop.is_set():
+                try:
+                    conn.execute('SELECT id, content FROM posts ORDER BY id DESC LIMIT 20').fetchall()
+                    done += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+            conn.close()
+            with lock:
+                counts['reads'] += done
+                counts['errors'] += errors
+
+        def writer():
+            conn = opener(path)
+            done = errors = 0
+            while not stop.is_set():
+                try:
+                    conn.execute('INSERT INTO posts (user_id, content) VALUES (?, ?)', (1, 'new post'))
+                    conn.commit()
+                    done += 1
+                except sqlite3.OperationalError:
+                    conn.rollback()
+                    errors += 1
+            conn.close()
+            with lock:
+                counts['writes'] += done
+                counts['errors'] += errors
+
+        threads = ([threading.Thread(target=reader) for _ in range(readers)] +
+                   [threading.Thread(target=writer) for _ in range(writers)])
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    return {key: value / seconds if key != 'errors' else value for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    args = parser.parse_args()
+
+    print(f'{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per mode')
+    for label, opener in (('rollback journal', connect_baseline), ('WAL', connect_tuned)):
+        result = run(opener, args.seconds, args.readers, args.writers)
+        print(f'{label:>16}: {result["reads"]:10.0f} reads/s {result["writes"]:8.0f} writes/s '
+              f'{result["errors"]:6d} lock errors')
+
+
+if __name__ == '__main__':
+    main()
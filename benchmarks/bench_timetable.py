@@ -0,0 +1,113 @@
+"""Compare the timetable page's old three-query load with the single-query load_week().
+
+The old path ran the main schedule join, then get_today_schedule() and
+get_weekly_summary(), each on its own connection. Both paths run against
+a throwaway database with the current schema.
+
+Run from the repository root:
+
+    python benchmarks/bench_timetable.py [--users 200] [--slots 20] [--loads 2000]
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blueprints.timetable import load_week
+from db import TRACKADEMIC_DB, connect
+from migrations import MIGRATIONS, migrate
+from tasks import COMPLETED_COLUMN, COMPLETIONS_JOIN, week_start
+
+
+def setup(path, users, slots):
+    conn = connect(path)
+    migrate(conn, MIGRATIONS[TRACKADEMIC_DB])
+    conn.executemany('INSERT INTO subjects (subject_name, subject_code) VALUES (?, ?)',
+                     ((f'Subject {i}', f'S{i:03}') for i in range(20)))
+    conn.executemany('INSERT INTO trackademic_users (username, email, password) VALUES (?, ?, ?)',
+                     ((f'user{i}', f'user{i}@example.com', 'x') for i in range(users)))
+    rows = []
+    for user_id in range(1, users + 1):
+        taken = random.sample([(day, start) for day in range(7) for start in range(16, 40)], slots)
+        for day, start in taken:
+            start_minutes, end_minutes = start * 30, start * 30 + 30
+            time_slot = f'{start_minutes // 60}:{start_minutes % 60:02} - {end_minutes // 60}:{end_minutes % 60:02}'
+            rows.append((random.randint(1, 20), user_id, day, time_slot, start_minutes, end_minutes))
+    conn.executemany('''
+        INSERT INTO timetable (subject_id, user_id, day, time_slot, start_minutes, end_minutes)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.close()
+
+
+def three_queries(path, user_id):
+    """The timetable view as it was: grid query plus two helpers with their own connections"""
+    today = datetime.datetime.today().weekday()
+    conn = connect(path)
+    conn.execute('''
+        SELECT t.*, s.subject_name, s.subject_code, t.task_description, ''' + COMPLETED_COLUMN + '''
+        FROM timetable t
+        JOIN subjects s ON t.subject_id = s.subject_id
+        ''' + COMPLETIONS_JOIN + '''
+        WHERE t.user_id = ?
+        ORDER BY t.day, t.start_minutes
+    ''', (week_start(), user_id)).fetchall()
+
+    today_conn = connect(path)
+    today_conn.execute('''
+        SELECT t.day, t.time_slot, s.subject_name, s.subject_code, t.task_description, s.subject_id
+        FROM timetable t
+        JOIN subjects s ON t.subject_id = s.subject_id
+        WHERE t.user_id = ? AND t.day = ?
+        ORDER BY t.start_minutes
+    ''', (user_id, today)).fetchall()
+    today_conn.close()
+
+    summary_conn = connect(path)
+    summary_conn.execute('''
+        SELECT t.day, t.time_slot, s.subject_name, s.subject_code, s.subject_id, t.task_description,
+               COUNT(*) as task_count
+        FROM timetable t
+        JOIN subjects s ON t.subject_id = s.subject_id
+        WHERE t.user_id = ?
+        GROUP BY t.day, s.subject_name, t.time_slot, s.subject_code, s.subject_id, t.task_description
+        ORDER BY t.day, t.start_minutes
+    ''', (user_id,)).fetchall()
+    summary_conn.close()
+    conn.close()
+
+
+def one_query(path, user_id):
+    conn = connect(path)
+    load_week(conn, user_id)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--slots', type=int, default=20)
+    parser.add_argument('--loads', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        setup(path, args.users, args.slots)
+        user_ids = [random.randint(1, args.users) for _ in range(args.loads)]
+
+        for label, load in (('three queries', three_queries), ('load_week', one_query)):
+            start = time.perf_counter()
+            for user_id in user_ids:
+                load(path, user_id)
+            elapsed = time.perf_counter() - start
+            print(f'{label:>14}: {elapsed * 1e6 / args.loads:7.1f} us per page load')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Content-addressed store for uploaded files.
+
+An upload is saved once under ``<sha256><ext>`` in the upload folder, however
+many posts attach it. The ``blobs`` table (social database) counts the posts
+referring to each file, and the file is removed once the deletion of the last
+of them has committed.
+
+Uploads are hashed before anything is written, so a file that is already
+stored costs a read but no disk writes. New files are copied in chunks to a
+temporary name and renamed into place, so readers never see a partial blob.
+"""
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+
+from werkzeug.utils import secure_filename
+
+CHUNK_SIZE = 64 * 1024
+
+# Only short alphanumeric extensions are kept in blob names
+MAX_EXTENSION_LENGTH = 10
+
+# Derived files (thumbnails) are kept in this subfolder, named after their blob
+THUMBNAIL_DIR = 'thumbs'
+
+# Names written by store_upload() and their thumbnails; their content never
+# changes, so clients may cache them forever
+BLOB_NAME = re.compile(r'(%s/)?[0-9a-f]{64}(\.[a-z0-9]{1,%d})?' % (THUMBNAIL_DIR, MAX_EXTENSION_LENGTH - 1))
+
+# Posts reference blobs by name; the upsert runs inside the caller's write transaction
+ADD_REFERENCE = '''
+    INSERT INTO blobs (name, size, refcount) VALUES (?, ?, 1)
+    ON CONFLICT(name) DO UPDATE SET refcount = refcount + 1
+'''
+
+
+def blob_extension(filename):
+    """Lower-cased extension of a client filename, or '' if it is missing or odd"""
+    extension = os.path.splitext(secure_filename(filename or ''))[1].lower()
+    if len(extension) > MAX_EXTENSION_LENGTH or not extension[1:].isalnum():
+        return ''
+    return extension
+
+
+def is_content_addressed(name):
+    """True for blob and thumbnail names derived from a hash (not files saved before the blob store)"""
+    return BLOB_NAME.fullmatch(name) is not None
+
+
+def blob_path(upload_folder, name):
+    return os.path.join(upload_folder, name)
+
+
+def _hash_stream(stream):
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def _write_blob(stream, path):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            shutil.copyfileobj(stream, out, CHUNK_SIZE)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def store_upload(conn, file, upload_folder):
+    """Save an uploaded FileStorage (if not already stored) and take a reference to it.
+
+    Returns the blob name to keep in ``posts.filename``. The reference is
+    part of conn's open transaction, so commit it together with the post.
+    """
+    stream = file.stream
+    if not stream.seekable():
+        spooled = tempfile.SpooledTemporaryFile(max_size=CHUNK_SIZE * 16)
+        shutil.copyfileobj(stream, spooled, CHUNK_SIZE)
+        stream = spooled
+    stream.seek(0)
+    digest, size = _hash_stream(stream)
+    name = digest + blob_extension(file.filename)
+
+    # Take the reference (and with it the write lock) before checking the file,
+    # so a concurrent remove_blob_file() cannot unlink it after the check
+    conn.execute(ADD_REFERENCE, (name, size))
+    path = blob_path(upload_folder, name)
+    if not os.path.exists(path):
+        stream.seek(0)
+        _write_blob(stream, path)
+    return name
+
+
+def release_blob(conn, name):
+    """Drop one post's reference to a blob, as part of conn's open transaction.
+
+    Returns True if that was the last reference; once the transaction has
+    committed, pass the name to remove_blob_file(). Removing the file before
+    the commit would lose it if the deletion rolled back.
+    """
+    conn.execute('UPDATE blobs SET refcount = refcount - 1 WHERE name = ?', (name,))
+    return conn.execute('DELETE FROM blobs WHERE name = ? AND refcount <= 0', (name,)).rowcount > 0
+
+
+def remove_blob_file(conn, name, upload_folder):
+    """Delete an unreferenced blob's file; returns True if it was deleted.
+
+    The check runs under the write lock, which store_upload() takes before
+    looking for the file, so an upload of the same content in the meantime
+    either re-created the row (and the file is kept) or waits and writes it anew.
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        if conn.execute('SELECT 1 FROM blobs WHERE name = ?', (name,)).fetchone():
+            return False
+        path = blob_path(upload_folder, name)
+        if os.path.exists(path):
+            os.remove(path)
+        return True
+    finally:
+        conn.rollback()
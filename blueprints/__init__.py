@@ -0,0 +1,31 @@
+"""Route groups, each registered on the app only when it is enabled.
+
+Modules are imported when registered, so a worker that serves only some
+subsystems never loads the code (or the helper modules) of the others.
+"""
+import importlib
+
+# Name -> module defining ``bp``, in registration order
+BLUEPRINTS = {
+    'auth': 'blueprints.auth',
+    'api': 'blueprints.api',
+    'admin': 'blueprints.admin',
+    'calculator': 'blueprints.calculator',
+    'timetable': 'blueprints.timetable',
+    'social': 'blueprints.social',
+    'notes': 'blueprints.notes',
+    'debug': 'blueprints.debug',
+}
+
+DEFAULT_BLUEPRINTS = [name for name in BLUEPRINTS if name != 'debug']
+
+
+def register_blueprints(app, names):
+    """Import and register the named blueprints"""
+    unknown = [name for name in names if name not in BLUEPRINTS]
+    if unknown:
+        raise ValueError(f"Unknown blueprints: {', '.join(unknown)}")
+    for name in BLUEPRINTS:
+        if name in names:
+            module = importlib.import_module(BLUEPRINTS[name])
+            app.register_blueprint(module.bp)
@@ -0,0 +1,601 @@
+"""Admin pages: subject, user and GPA management and the database reset routes"""
+from flask import Blueprint, jsonify, redirect, request, session
+
+from admin_tables import TablePage, stream_table
+from db import get_db_connection
+from gpa_analytics import cohort_stats
+from identity import IDENTITY_CACHE, forget_trackademic_user
+from tasks import WEEK_CACHE, forget_week
+
+bp = Blueprint('admin', __name__)
+
+# Sort keys offered on the admin tables; each ends in a unique column so pages are stable
+SUBJECT_SORTS = {
+    'id': ('subject_id',),
+    'code': ('subject_code', 'subject_id'),
+    'name': ('subject_name',),
+    'credits': ('credit_hours', 'subject_id'),
+}
+USER_SORTS = {
+    'id': ('user_id',),
+    'username': ('username',),
+    'email': ('email',),
+    'admin': ('is_admin', 'user_id'),
+}
+GPA_SORTS = {
+    'id': ('g.gpa_id',),
+    'user': ('g.user_id', 'g.trimester'),
+    'username': ('u.username', 'g.trimester'),
+    'email': ('u.email', 'g.trimester'),
+    'trimester': ('g.trimester', 'g.user_id'),
+    'gpa': ('g.gpa', 'g.gpa_id'),
+    'credits': ('g.total_credits', 'g.gpa_id'),
+}
+
+# ============ ADMIN HOME PAGE ============
+@bp.route('/admin/home')
+def admin_home():
+    """Admin-only home page"""
+    if 'user_id' not in session or 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/login')
+    
+    return '''
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Admin Dashboard</title>
+        <link rel="stylesheet" href="/static/home-styles.css">
+    </head>
+    <body class="trackademic-body trackademic-home">  <!-- Added trackademic-home class here -->
+        <div class="home-container">
+            <div class="home-header">
+                <h1>Admin Dashboard</h1>
+                <p>Welcome back, ''' + session.get('username', 'Admin') + '''!</p>
+            </div>
+            
+            <div class="welcome-section">
+                <h2>Trackademic Administration</h2>
+                <p>Manage all aspects of the Trackademic platform from this dashboard</p>
+            </div>
+            
+            <div class="apps-grid">
+                <div class="admin-section">
+                    <h3 style="color: #667eea; margin-bottom: 20px; border-bottom: 2px solid #eee; padding-bottom: 10px;">Applications:</h3>
+                    <div class="apps-grid" style="grid-template-columns: 1fr; gap: 15px; padding: 0;">
+                        <a href="/trackademic/timetable" class="app-card">
+                            <div class="app-icon">📅</div>
+                            <h3>Timetable</h3>
+                            <p>Manage and edit the academic timetable</p>
+                        </a>
+                        
+                        <a href="/trackademic/calculator" class="app-card">
+                            <div class="app-icon">🧮</div>
+                            <h3>GPA Calculator</h3>
+                            <p>Access the GPA calculator and view GPA data</p>
+                        </a>
+                        
+                        <a href="/social/dashboard" class="app-card">
+                            <div class="app-icon">👥</div>
+                            <h3>Social Dashboard</h3>
+                            <p>Access the social platform dashboard</p>
+                        </a>
+                    </div>
+                </div>
+                
+                <div class="admin-section">
+                    <h3 style="color: #667eea; margin-bottom: 20px; border-bottom: 2px solid #eee; padding-bottom: 10px;">View Data:</h3>
+                    <div class="apps-grid" style="grid-template-columns: 1fr; gap: 15px; padding: 0;">
+                        <a href="/trackademic/subjects" class="app-card">
+                            <div class="app-icon">📚</div>
+                            <h3>All Subjects</h3>
+                            <p>View, edit, and manage all subjects in the system</p>
+                        </a>
+                        
+                        <a href="/trackademic/user" class="app-card">
+                            <div class="app-icon">👤</div>
+                            <h3>All Users</h3>
+                            <p>View and manage user accounts and permissions</p>
+                        </a>
+                        
+                        <a href="/trackademic/gpa" class="app-card">
+                            <div class="app-icon">📊</div>
+                            <h3>GPA Data</h3>
+                            <p>View and manage GPA records and history</p>
+                        </a>
+                    </div>
+                </div>
+                
+                <div class="admin-section">
+                    <h3 style="color: #667eea; margin-bottom: 20px; border-bottom: 2px solid #eee; padding-bottom: 10px;">Reset Data:</h3>
+                    <div class="apps-grid" style="grid-template-columns: 1fr; gap: 15px; padding: 0;">
+                        <a href="/trackademic/create-subjects-db" class="app-card" style="background: #fff5f5; border-color: #fc8181;">
+                            <div class="app-icon" style="color: #fc8181;">🔄</div>
+                            <h3>Reset Subjects</h3>
+                            <p>Reset the subjects database with sample data</p>
+                        </a>
+                        
+                        <a href="/trackademic/create-user-db" class="app-card" style="background: #fff5f5; border-color: #fc8181;">
+                            <div class="app-icon" style="color: #fc8181;">🔄</div>
+                            <h3>Reset Users</h3>
+                            <p>Reset the user database with sample data</p>
+                        </a>
+                        
+                        <a href="/trackademic/create-gpa-db" class="app-card" style="background: #fff5f5; border-color: #fc8181;">
+                            <div class="app-icon" style="color: #fc8181;">🔄</div>
+                            <h3>Reset GPA</h3>
+                            <p>Reset the GPA database with sample data</p>
+                        </a>
+                        
+                        <a href="/trackademic/edit_timetable" class="app-card" style="background: #fff5f5; border-color: #fc8181;">
+                            <div class="app-icon" style="color: #fc8181;">🔄</div>
+                            <h3>Reset Timetable</h3>
+                            <p>Clear and reset the timetable (Enter Edit Mode)</p>
+                        </a>
+                    </div>
+                </div>
+            </div>
+            
+            <div class="actions-section">
+                <a href="/logout" class="logout-btn">Logout</a>
+            </div>
+        </div>
+        <style>
+            .admin-section {
+                background: #f8f9fa;
+                padding: 20px;
+                border-radius: 15px;
+                margin-bottom: 20px;
+            }
+            
+            .admin-section h3 {
+                font-size: 1.2rem;
+                color: #667eea;
+            }
+            
+            .apps-grid {
+                grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+            }
+            
+            @media (max-width: 768px) {
+                .apps-grid {
+                    grid-template-columns: 1fr;
+                }
+            }
+        </style>
+    </body>
+    </html>
+    '''
+
+@bp.route('/admin/cache-stats')
+def cache_stats():
+    """Hit/miss counters for this worker's in-process caches"""
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return jsonify({'success': False, 'error': 'Admin access required'}), 403
+    
+    return jsonify({
+        'success': True,
+        'caches': {
+            'identity': IDENTITY_CACHE.stats(),
+            'timetable_week': WEEK_CACHE.stats(),
+        }
+    })
+
+@bp.route('/admin/analytics/gpa')
+def gpa_analytics():
+    """Cohort GPA distribution: histogram, mean, percentiles and credit load per trimester"""
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return jsonify({'success': False, 'error': 'Admin access required'}), 403
+    
+    trimester = request.args.get('trimester') or None
+    bin_width = request.args.get('bin_width', 0.5, type=float)
+    if not 0.01 <= bin_width <= 4:
+        return jsonify({'success': False, 'error': 'bin_width must be between 0.01 and 4'}), 400
+    
+    conn = get_db_connection()
+    try:
+        stats = cohort_stats(conn, trimester, bin_width)
+    finally:
+        conn.close()
+    
+    return jsonify({'success': True, **stats})
+
+# ============ TRACKADEMIC SUBJECT ROUTES ============
+@bp.route('/trackademic/subjects')
+def list_subjects():
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    try:
+        page = TablePage(SUBJECT_SORTS, 'id')
+        subjects = page.rows(get_db_connection(), 'SELECT * FROM subjects')
+        return stream_table('All Subjects', [{
+            'links': [('+ Add New Subject', '/trackademic/add-subject-form-db')],
+            'columns': [('ID', 'id'), ('Code', 'code'), ('Subject Name', 'name'), ('Credit Hours', 'credits'), ('Actions', None)],
+            'rows': (
+                (
+                    (subject['subject_id'], subject['subject_code'], subject['subject_name'], subject['credit_hours']),
+                    [
+                        ('Edit', f'/trackademic/edit-subject/{subject["subject_id"]}', None),
+                        ('Delete', f'/trackademic/delete-subject/{subject["subject_id"]}',
+                         'Are you sure you want to delete this subject?'),
+                    ],
+                )
+                for subject in subjects
+            ),
+            'page': page,
+            'empty': 'No subjects found.',
+            'empty_link': ('Reset subjects database', '/trackademic/create-subjects-db'),
+        }], footer_links=[('Back to Admin Home', '/admin/home')])
+    except Exception as e:
+        return f'<h1>Error accessing database: {str(e)}</h1>'
+
+@bp.route('/trackademic/add-subject-form-db', methods=['GET', 'POST'])
+def add_subject_form_db():
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    if request.method == 'POST':
+        subject_name = request.form['subject_name']
+        subject_code = request.form['subject_code']
+        credit_hours = request.form['credit_hours']
+        
+        try:
+            conn = get_db_connection()
+            conn.execute(
+                'INSERT INTO subjects (subject_name, subject_code, credit_hours) VALUES (?, ?, ?)',
+                (subject_name, subject_code, credit_hours)
+            )
+            conn.commit()
+            conn.close()
+            return redirect('/trackademic/subjects')
+        except Exception as e:
+            return f'<h1>Failed to add subject: {str(e)}</h1><p><a href="/trackademic/add-subject-form-db">Try again</a></p>'
+    
+    return '''
+    <h1>Add New Subject</h1>
+    <form method="POST" style="max-width: 500px;">
+        <div style="margin: 10px 0;">
+            <label for="subject_name">Subject Name:</label><br>
+            <input type="text" id="subject_name" name="subject_name" required style="width: 100%; padding: 8px; margin: 5px 0;">
+        </div>
+        <div style="margin: 10px 0;">
+            <label for="subject_code">Subject Code:</label><br>
+            <input type="text" id="subject_code" name="subject_code" required style="width: 100%; padding: 8px; margin: 5px 0;">
+        </div>
+        <div style="margin: 10px 0;">
+            <label for="credit_hours">Credit Hours:</label><br>
+            <input type="number" id="credit_hours" name="credit_hours" value="3" min="1" max="6" style="width: 100%; padding: 8px; margin: 5px 0;">
+        </div>
+        <div style="margin: 10px 0;">
+            <input type="submit" value="Add Subject" style="padding: 10px 20px; border: none; border-radius: 5px; cursor: pointer;">
+            <a href="/trackademic/subjects" style="background: #ccc; color: black; padding: 10px 20px; text-decoration: none; border-radius: 5px; margin-left: 10px;">Cancel</a>
+        </div>
+    </form>
+    '''
+
+@bp.route('/trackademic/edit-subject/<int:subject_id>', methods=['GET', 'POST'])
+def edit_subject(subject_id):
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    conn = get_db_connection()
+    
+    if request.method == 'POST':
+        subject_name = request.form['subject_name']
+        subject_code = request.form['subject_code']
+        credit_hours = request.form['credit_hours']
+        
+        try:
+            conn.execute(
+                'UPDATE subjects SET subject_name = ?, subject_code = ?, credit_hours = ? WHERE subject_id = ?',
+                (subject_name, subject_code, credit_hours, subject_id)
+            )
+            conn.commit()
+            conn.close()
+            forget_week()
+            return redirect('/trackademic/subjects')
+        except Exception as e:
+            conn.close()
+            return f'<h1>Error updating subject!</h1><p><a href="/trackademic/edit-subject/{subject_id}">Try again</a></p>'
+    
+    subject = conn.execute('SELECT * FROM subjects WHERE subject_id = ?', (subject_id,)).fetchone()
+    conn.close()
+    
+    if not subject:
+        return '<h1>Subject not found</h1><p><a href="/trackademic/subjects">Back to subjects</a></p>'
+    
+    return f'''
+    <h1>Edit Subject</h1>
+    <form method="POST" style="max-width: 500px;">
+        <div style="margin: 10px 0;">
+            <label for="subject_name">Subject Name:</label><br>
+            <input type="text" id="subject_name" name="subject_name" value="{subject['subject_name']}" required style="width: 100%; padding: 8px; margin: 5px 0;">
+        </div>
+        <div style="margin: 10px 0;">
+            <label for="subject_code">Subject Code:</label><br>
+            <input type="text" id="subject_code" name="subject_code" value="{subject['subject_code']}" required style="width: 100%; padding: 8px; margin: 5px 0;">
+        </div>
+        <div style="margin: 10px 0;">
+            <label for="credit_hours">Credit Hours:</label><br>
+            <input type="number" id="credit_hours" name="credit_hours" value="{subject['credit_hours']}" min="1" max="6" style="width: 100%; padding: 8px; margin: 5px 0;">
+        </div>
+        <div style="margin: 10px 0;">
+            <input type="submit" value="Update Subject" style="background: #2196F3; color: white; padding: 10px 20px; border: none; border-radius: 5px; cursor: pointer;">
+            <a href="/trackademic/subjects" style="background: #ccc; color: black; padding: 10px 20px; text-decoration: none; border-radius: 5px; margin-left: 10px;">Cancel</a>
+        </div>
+    </form>
+    '''
+
+@bp.route('/trackademic/delete-subject/<int:subject_id>')
+def delete_subject(subject_id):
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    try:
+        conn = get_db_connection()
+        conn.execute('DELETE FROM subjects WHERE subject_id = ?', (subject_id,))
+        conn.commit()
+        conn.close()
+        forget_week()
+        return f'<h1>Subject deleted successfully!</h1><p><a href="/trackademic/subjects">Back to subjects</a></p>'
+    except Exception as e:
+        return f'<h1>Error deleting subject!</h1><p><a href="/trackademic/subjects">Back to subjects</a></p>'
+
+# ============ TRACKADEMIC USER ROUTES ============
+@bp.route('/trackademic/user')
+def list_user():
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    try:
+        page = TablePage(USER_SORTS, 'id')
+        users = page.rows(get_db_connection(), 'SELECT * FROM trackademic_users')
+        return stream_table('All Users', [{
+            'columns': [('ID', 'id'), ('Username', 'username'), ('Email', 'email'), ('Password', None),
+                        ('Is Admin', 'admin'), ('Actions', None)],
+            'rows': (
+                (
+                    (user['user_id'], user['username'], user['email'], user['password'],
+                     'Yes' if user['is_admin'] == 1 else 'No'),
+                    [('Delete', f'/trackademic/delete-user/{user["user_id"]}', 'Are you sure you want to delete this user?')],
+                )
+                for user in users
+            ),
+            'page': page,
+            'empty': 'No user found.',
+            'empty_link': ('Reset users database', '/trackademic/reset-users'),
+        }], footer_links=[('Back to Admin Home', '/admin/home')])
+    except Exception as e:
+        return f'<h1>Error accessing database: {str(e)}</h1>'
+
+@bp.route('/trackademic/delete-user/<int:user_id>')
+def delete_user(user_id):
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    try:
+        conn = get_db_connection()
+        conn.execute('DELETE FROM trackademic_users WHERE user_id = ?', (user_id,))
+        conn.commit()
+        conn.close()
+        forget_trackademic_user(user_id)
+        return f'<h1>User deleted successfully!</h1><p><a href="/trackademic/user">Back to users</a></p>'
+    except Exception as e:
+        return f'<h1>Error deleting user! {str(e)}</h1><p><a href="/trackademic/user">Back to users</a></p>'
+
+# ============ TRACKADEMIC GPA ROUTES ============
+@bp.route('/trackademic/gpa')
+def list_gpa():
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    try:
+        page = TablePage(GPA_SORTS, 'user')
+        # GPA data with usernames
+        gpa_data = page.rows(get_db_connection(), '''
+            SELECT g.*, u.username, u.email 
+            FROM gpa g 
+            JOIN trackademic_users u ON g.user_id = u.user_id
+        ''')
+        return stream_table('All GPA Data', [{
+            'links': [('Cohort statistics (JSON)', '/admin/analytics/gpa')],
+            'columns': [('ID', 'id'), ('User', 'username'), ('Email', 'email'), ('Trimester', 'trimester'),
+                        ('GPA', 'gpa'), ('Credits', 'credits'), ('Actions', None)],
+            'rows': (
+                (
+                    (gpa['gpa_id'], gpa['username'], gpa['email'], gpa['trimester'], f'{gpa["gpa"]:.2f}', gpa['total_credits']),
+                    [('Delete', f'/trackademic/delete-gpa/{gpa["gpa_id"]}', 'Are you sure you want to delete this GPA record?')],
+                )
+                for gpa in gpa_data
+            ),
+            'page': page,
+            'empty': 'No GPA data found.',
+        }], footer_links=[('Back to Admin Home', '/admin/home')])
+    except Exception as e:
+        return f'<h1>Error accessing database: {str(e)}</h1>'
+
+@bp.route('/trackademic/delete-gpa/<int:gpa_id>')
+def delete_gpa(gpa_id):
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    try:
+        conn = get_db_connection()
+        conn.execute('DELETE FROM gpa WHERE gpa_id = ?', (gpa_id,))
+        conn.commit()
+        conn.close()
+        return f'<h1>GPA record deleted successfully!</h1><p><a href="/trackademic/gpa">Back to GPA Data</a></p>'
+    except Exception as e:
+        return f'<h1>Error deleting GPA! {str(e)}</h1><p><a href="/trackademic/gpa">Back to GPA Data</a></p>'
+
+# ============ TRACKADEMIC DATABASE RESET ROUTES ============
+@bp.route('/trackademic/create-subjects-db')
+def create_subjects_database_route():
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    try:
+        # Reset subjects table with sample data
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA foreign_keys = OFF")
+        cursor.execute('DELETE FROM subjects')
+        
+        # Add sample subjects from app (1).py
+        subjects = [
+            ('Introduction to Business Management', 'GNB1114', 4),
+            ('Introduction to Computing Technologies', 'CCT1114', 4),
+            ('Communicative English', 'LCE1113', 3),
+            ('Mathematics I', 'CMT1114', 4),
+            ('Problem Solving & Program Design', 'CSP1114', 4),
+            ('Essential English', 'LEE1113', 3),
+            ('Multimedia Fundamentals', 'CMF1114', 4),
+            ('Mathematics II', 'CMT1124', 4),
+            ('Critical Thinking', 'LCT1113', 3),
+            ('Introduction to Digital Systems', 'CDS1114', 4),
+            ('Academic English', 'LAE1113', 3),
+            ('Mathematics III', 'CMT1134', 4),
+            ('Principles of Physics', 'CPP1113', 3),
+            ('Mini IT Project', 'CSP1123', 3),
+        ]
+        
+        cursor.executemany(
+            'INSERT INTO subjects (subject_name, subject_code, credit_hours) VALUES (?, ?, ?)',
+            subjects
+        )
+        
+        cursor.execute("PRAGMA foreign_keys = ON")
+        conn.commit()
+        conn.close()
+        forget_week()
+        return '''
+        <h1>Subjects database reset successfully!</h1>
+        <p><a href="/trackademic/subjects">View Subjects</a></p>
+        <p><a href="/admin/home">Back to Admin Home</a></p>
+        '''
+    except Exception as e:
+        return f'<h1>Error creating database! {str(e)}</h1>'
+
+@bp.route('/trackademic/create-notes-db')
+def create_notes_database_route():
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    try:
+        # Reset notes table with sample data
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA foreign_keys = OFF")
+        cursor.execute('DELETE FROM note_chunks')
+        cursor.execute('DELETE FROM notes')
+        
+        # Add sample notes from app (1).py
+        notes = [
+            (1, 1, 'business_notes.pdf'),
+            (2, 1, 'computing_notes.pdf'),
+            (3, 1, 'english_notes.pdf'),
+        ]
+        
+        cursor.executemany(
+            'INSERT INTO notes (subject_id, user_id, file_name) VALUES (?, ?, ?)',
+            notes
+        )
+        
+        cursor.execute("PRAGMA foreign_keys = ON")
+        conn.commit()
+        conn.close()
+        return '''
+        <h1>Notes database reset successfully!</h1>
+        <p><a href="/admin/home">Back to Admin Home</a></p>
+        '''
+    except Exception as e:
+        return f'<h1>Error creating database! {str(e)}</h1>'
+
+@bp.route('/trackademic/create-gpa-db')
+def create_gpa_database_route():
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        # Clear existing data but keep the table structure
+        cursor.execute('DELETE FROM gpa')
+        
+        # Get admin user ID to assign sample data
+        cursor.execute("SELECT user_id FROM trackademic_users WHERE email='admin@login.com'")
+        admin_result = cursor.fetchone()
+        
+        if admin_result:
+            admin_id = admin_result[0]
+            
+            # Add sample GPA data with admin user_id
+            gpa_data = [
+                (admin_id, 'Sample', 3.75, 12, 45.0),
+            ]
+            
+            cursor.executemany(
+                'INSERT INTO gpa (user_id, trimester, gpa, total_credits, total_grade_points) VALUES (?, ?, ?, ?, ?)',
+                gpa_data
+            )
+        
+        conn.commit()
+        conn.close()
+        return '''
+        <h1>GPA database reset successfully!</h1>
+        <p><a href="/trackademic/gpa">View GPA Data</a></p>
+        <p><a href="/admin/home">Back to Admin Home</a></p>
+        '''
+    except Exception as e:
+        return f'<h1>Error creating database! {str(e)}</h1>'
+    
+@bp.route('/trackademic/create-user-db')
+def create_user_database_route():
+    # Check if user is admin
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return redirect('/trackademic')
+    
+    try:
+        # Reset trackademic users table with sample data
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        current_user_id = session.get('user_id', None)
+        
+        cursor.execute('DELETE FROM trackademic_users')
+        cursor.execute('DELETE FROM sqlite_sequence WHERE name="trackademic_users"')
+        
+        # Add sample user from app (1).py
+        user_data = [
+            ('jiaxian0331', 'hoejiaxian@gmail.com', 'jiaxian0000', 0),
+            ('admin', 'admin@login.com', 'admin3.142', 1)
+        ]
+        
+        cursor.executemany(
+            'INSERT INTO trackademic_users (username, email, password, is_admin) VALUES (?, ?, ?, ?)',
+            user_data
+        )
+        
+        conn.commit()
+        conn.close()
+        forget_trackademic_user()
+        return '''
+        <h1>User database reset successfully!</h1>
+        <p><a href="/trackademic/user">View Users</a></p>
+        <p><a href="/admin/home">Back to Admin Home</a></p>
+        '''
+    except Exception as e:
+        return f'<h1>Error creating user database! {str(e)}</h1>'
@@ -0,0 +1,206 @@
+"""JSON endpoints used by the GPA calculator page"""
+from flask import Blueprint, current_app, jsonify, request, session
+
+from catalog import get_subject_catalog
+from db import get_db_connection
+from gpa_totals import get_cgpa, get_gpa_version
+from identity import current_trackademic_user_id
+
+bp = Blueprint('api', __name__)
+
+def conditional_json(etag, cache_control, build):
+    """JSON response tagged with a strong ETag; 304 without calling build() if the client has it"""
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+# ============ API ENDPOINTS ============
+@bp.route('/api/subjects', methods=['GET'])
+def api_get_subjects():
+    """API endpoint to get all subjects for the calculator"""
+    try:
+        catalog = get_subject_catalog()
+        
+        return conditional_json(f'subjects-{catalog.version}', 'public, no-cache', lambda: {
+            'success': True,
+            'subjects': list(catalog.calculator_subjects)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@bp.route('/api/save-trimester', methods=['POST'])
+def api_save_trimester():
+    """API endpoint to save trimester GPA data - FIXED VERSION"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'success': False, 'error': 'Not authenticated'}), 401
+        
+        data = request.json
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'success': False, 'error': 'Database connection failed'}), 500
+        
+        # Find (or create) the trackademic account of the logged-in user
+        trackademic_user_id = current_trackademic_user_id(conn, create=True)
+        
+        if not trackademic_user_id:
+            conn.close()
+            return jsonify({
+                'success': False,
+                'error': 'Could not find or create trackademic user record'
+            }), 404
+        
+        # Now use the trackademic_user_id to save GPA data
+        user_id = trackademic_user_id
+        
+        # Validate required fields
+        trimester_name = data.get('trimester', 'Trimester 1')
+        gpa_value = float(data.get('gpa', 0.0))
+        total_credits = int(data.get('total_credits', 0))
+        total_grade_points = float(data.get('total_grade_points', 0.0))
+        
+        # Validate GPA range
+        if not (0.0 <= gpa_value <= 4.0):
+            conn.close()
+            return jsonify({
+                'success': False, 
+                'error': 'GPA must be between 0.0 and 4.0'
+            }), 400
+        
+        # Check if trimester already exists for this user
+        existing = conn.execute(
+            'SELECT * FROM gpa WHERE user_id = ? AND trimester = ?', 
+            (user_id, trimester_name)
+        ).fetchone()
+        
+        if existing:
+            # Update existing record
+            conn.execute(
+                '''UPDATE gpa 
+                   SET gpa = ?, total_credits = ?, total_grade_points = ?, created_at = CURRENT_TIMESTAMP
+                   WHERE user_id = ? AND trimester = ?''',
+                (gpa_value, total_credits, total_grade_points, user_id, trimester_name)
+            )
+            action = 'updated'
+        else:
+            # Insert new record
+            conn.execute(
+                '''INSERT INTO gpa 
+                   (user_id, trimester, gpa, total_credits, total_grade_points) 
+                   VALUES (?, ?, ?, ?, ?)''',
+                (user_id, trimester_name, gpa_value, total_credits, total_grade_points)
+            )
+            action = 'saved'
+        
+        conn.commit()
+        
+        # Verify the save was successful
+        saved = conn.execute(
+            'SELECT * FROM gpa WHERE user_id = ? AND trimester = ?', 
+            (user_id, trimester_name)
+        ).fetchone()
+        
+        conn.close()
+        
+        if saved:
+            return jsonify({
+                'success': True,
+                'message': f'Trimester {trimester_name} {action} successfully',
+                'data': {
+                    'user_id': user_id,
+                    'trimester': trimester_name,
+                    'gpa': gpa_value,
+                    'total_credits': total_credits,
+                    'total_grade_points': total_grade_points
+                }
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to save trimester data'
+            }), 500
+            
+    except Exception as e:
+        # Log the full error for debugging
+        print(f"Error in api_save_trimester: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    
+@bp.route('/api/cgpa-history', methods=['GET'])
+def api_get_cgpa_history():
+    """API endpoint to get CGPA history for current user"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'success': False, 'error': 'Not authenticated'}), 401
+        
+        # Get trackademic user ID
+        conn = get_db_connection()
+        trackademic_user_id = current_trackademic_user_id(conn)
+        
+        if not trackademic_user_id:
+            conn.close()
+            return jsonify({
+                'success': True,
+                'history': [],
+                'message': 'No GPA data found for user'
+            })
+        
+        # Bumped by the gpa triggers on every insert, update or delete
+        etag = f'gpa-{trackademic_user_id}-{get_gpa_version(conn, trackademic_user_id)}'
+        
+        def build_history():
+            # Get GPA data for the trackademic user
+            gpa_data = conn.execute('''
+                SELECT gpa_id as id, 
+                       trimester, 
+                       gpa,
+                       total_credits,
+                       total_grade_points,
+                       created_at as date
+                FROM gpa 
+                WHERE user_id = ?
+                ORDER BY trimester
+            ''', (trackademic_user_id,)).fetchall()
+            
+            # Convert to list of dictionaries
+            history_list = []
+            for item in gpa_data:
+                history_list.append({
+                    'id': item['id'],
+                    'semester': item['trimester'],
+                    'date': item['date'] or 'Not Available',
+                    'gpa': float(item['gpa']),
+                    'totalCredits': item['total_credits'] or 0,
+                    'totalGradePoints': item['total_grade_points'] or 0
+                })
+            
+            return {
+                'success': True,
+                'history': history_list,
+                'cgpa': get_cgpa(conn, trackademic_user_id)
+            }
+        
+        response = conditional_json(etag, 'private, no-cache', build_history)
+        response.vary.add('Cookie')
+        conn.close()
+        return response
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
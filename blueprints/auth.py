@@ -0,0 +1,266 @@
+"""Landing page, login, signup and logout"""
+import sqlite3
+
+from flask import Blueprint, redirect, render_template, request, session
+
+from db import get_db_connection, get_social_db_connection
+from identity import remember_identity
+from sessions import regenerate_session
+
+bp = Blueprint('auth', __name__)
+
+# ============ COMMON ROUTES ============
+@bp.route('/')
+def home():
+    """Main landing page"""
+    if 'user_id' in session:
+        # Check if user is admin
+        if 'is_admin' in session and session['is_admin'] == 1:
+            return redirect('/admin/home')
+        elif 'app_mode' in session and session['app_mode'] == 'social':
+            return redirect('/social/dashboard')
+        else:
+            return redirect('/trackademic')
+    return render_template('home.html')
+
+@bp.route('/set-app-mode/<mode>')
+def set_app_mode(mode):
+    """Set the current application mode"""
+    if 'user_id' not in session:
+        return redirect('/login')
+    
+    session['app_mode'] = mode
+    if mode == 'social':
+        return redirect('/social/dashboard')
+    else:
+        return redirect('/trackademic')
+
+# ============ AUTHENTICATION ROUTES ============
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    """Unified login page"""
+    if request.method == 'POST':
+        email = request.form['email']
+        password = request.form['password']
+        app_choice = request.form.get('app_choice', 'trackademic')
+        
+        # Check if this is admin login
+        if email == 'admin@login.com':
+            # Try social database first
+            db = get_social_db_connection()
+            cursor = db.execute("SELECT * FROM users WHERE email=? AND password=?", (email, password))
+            user = cursor.fetchone()
+            db.close()
+            
+            if user:
+                regenerate_session(session)
+                session['user_id'] = user['id']
+                session['login_source'] = 'social'
+                session['username'] = user['username']
+                session['app_mode'] = app_choice
+                session['is_admin'] = 1  # Mark as admin
+                # NEW: Store trackademic user ID and email
+                session['trackademic_user_id'] = user['id']
+                session['email'] = email
+                return redirect('/admin/home')
+            
+            # Try trackademic database
+            conn = get_db_connection()
+            track_user = conn.execute(
+                "SELECT * FROM trackademic_users WHERE email=? AND password=?",
+                (email, password)
+            ).fetchone()
+            conn.close()
+            
+            if track_user:
+                regenerate_session(session)
+                session['user_id'] = track_user['user_id']
+                session['login_source'] = 'trackademic'
+                session['username'] = track_user['username']
+                session['app_mode'] = app_choice
+                session['is_admin'] = 1  # Mark as admin
+                # NEW: Store trackademic user ID and email
+                session['trackademic_user_id'] = track_user['user_id']
+                session['email'] = email
+                return redirect('/admin/home')
+        
+        # Regular user login
+        # Try social database first
+        db = get_social_db_connection()
+        cursor = db.execute("SELECT * FROM users WHERE email=? AND password=?", (email, password))
+        user = cursor.fetchone()
+        db.close()
+        
+        if user:
+            regenerate_session(session)
+            session['user_id'] = user['id']
+            session['login_source'] = 'social'
+            session['username'] = user['username']
+            session['app_mode'] = app_choice
+            session['is_admin'] = 0  # Regular user
+            
+            # NEW: Store trackademic user ID and email in session
+            conn = get_db_connection()
+            track_user = conn.execute(
+                "SELECT user_id FROM trackademic_users WHERE email=?",
+                (email,)
+            ).fetchone()
+            
+            if track_user:
+                session['trackademic_user_id'] = track_user['user_id']
+                session['email'] = email  # Store email for GPA lookups
+                remember_identity(conn, user['id'], track_user['user_id'])
+            else:
+                # If not found, use social user ID as fallback
+                session['trackademic_user_id'] = user['id']
+                session['email'] = email
+            conn.close()
+            
+            if app_choice == 'social':
+                return redirect('/social/dashboard')
+            else:
+                # Also check trackademic user table
+                conn = get_db_connection()
+                track_user = conn.execute(
+                    "SELECT * FROM trackademic_users WHERE email=? AND password=?",
+                    (email, password)
+                ).fetchone()
+                conn.close()
+                
+                if not track_user:
+                    # Create trackademic user record if it doesn't exist
+                    conn = get_db_connection()
+                    conn.execute(
+                        "INSERT OR IGNORE INTO trackademic_users (username, email, password) VALUES (?, ?, ?)",
+                        (user['username'], email, password)
+                    )
+                    conn.commit()
+                    conn.close()
+                
+                return redirect('/trackademic')
+        
+        # Try trackademic database
+        conn = get_db_connection()
+        track_user = conn.execute(
+            "SELECT * FROM trackademic_users WHERE email=? AND password=?",
+            (email, password)
+        ).fetchone()
+        conn.close()
+        
+        if track_user:
+            regenerate_session(session)
+            session['user_id'] = track_user['user_id']
+            session['login_source'] = 'trackademic'
+            session['username'] = track_user['username']
+            session['app_mode'] = app_choice
+            session['is_admin'] = 0  # Regular user
+            
+            # NEW: Store trackademic user ID and email
+            session['trackademic_user_id'] = track_user['user_id']
+            session['email'] = email
+            
+            if app_choice == 'social':
+                # Create social user record if it doesn't exist
+                db = get_social_db_connection()
+                db.execute(
+                    "INSERT OR IGNORE INTO users (username, email, password) VALUES (?, ?, ?)",
+                    (track_user['username'], email, password)
+                )
+                db.commit()
+                db.close()
+                return redirect('/social/dashboard')
+            else:
+                return redirect('/trackademic')
+        
+        return render_template('login.html', error="Wrong email or password.")
+    
+    return render_template('login.html')
+
+@bp.route('/signup', methods=['GET', 'POST'])
+def signup():
+    """Unified signup page"""
+    if request.method == 'POST':
+        username = request.form['username']
+        email = request.form['email']
+        password = request.form['password']
+        confirm_password = request.form.get('confirm_password', '')
+        
+        # Add password confirmation check
+        if password != confirm_password:
+            return render_template('signup.html', error="Passwords do not match.")
+        
+        # Prevent using admin email
+        if email == 'admin@login.com':
+            return render_template('signup.html', error="This email is reserved for admin.")
+        
+        trackademic_conn = None
+        social_db = None
+        
+        try:
+            # Create user in trackademic database
+            trackademic_conn = get_db_connection()  # trackademic.db
+            trackademic_conn.execute(
+                "INSERT INTO trackademic_users (username, email, password, is_admin) VALUES (?, ?, ?, 0)",
+                (username, email, password)
+            )
+            trackademic_conn.commit()
+            
+            # Get the trackademic user ID
+            track_user = trackademic_conn.execute(
+                "SELECT user_id FROM trackademic_users WHERE email=?",
+                (email,)
+            ).fetchone()
+            trackademic_user_id = track_user['user_id']
+            
+            # Create user in social database
+            social_db = get_social_db_connection()  # social.db
+            social_db.execute(
+                "INSERT INTO users (username, email, password, is_admin) VALUES (?, ?, ?, 0)",
+                (username, email, password)
+            )
+            social_db.commit()
+            
+            # Get user ID from social DB
+            cursor = social_db.execute("SELECT * FROM users WHERE email=?", (email,))
+            user = cursor.fetchone()
+            
+            if not user:
+                return render_template('signup.html', error="Error creating account. Please try again.")
+            
+            # Link the two accounts so GPA requests don't have to look the user up again
+            remember_identity(trackademic_conn, user['id'], trackademic_user_id)
+            
+            # Set session variables
+            regenerate_session(session)
+            session['user_id'] = user['id']
+            session['login_source'] = 'social'
+            session['username'] = username
+            session['app_mode'] = 'trackademic'  # Default to trackademic
+            session['is_admin'] = 0  # Regular user
+            
+            # NEW: Store trackademic user ID and email in session
+            session['trackademic_user_id'] = trackademic_user_id
+            session['email'] = email
+            
+            # Redirect to trackademic by default
+            return redirect('/trackademic')
+                
+        except sqlite3.IntegrityError:
+            return render_template('signup.html', error="Email already exists.")
+        except Exception as e:
+            print(f"Signup error: {e}")
+            return render_template('signup.html', error=f"Error creating account: {str(e)}")
+        finally:
+            # Ensure connections are closed
+            if trackademic_conn:
+                trackademic_conn.close()
+            if social_db:
+                social_db.close()
+    
+    return render_template('signup.html')
+
+@bp.route('/logout')
+def logout():
+    """Logout from both systems"""
+    session.clear()
+    return redirect('/login')
@@ -0,0 +1,401 @@
+"""GPA calculator page and its server-side grade calculations"""
+import datetime
+
+from flask import Blueprint, flash, redirect, render_template, request, session
+
+from catalog import get_subject_catalog
+from db import get_db_connection
+from gpa_totals import get_cgpa
+from identity import current_trackademic_user_id
+
+bp = Blueprint('calculator', __name__)
+
+# ============ CALCULATOR HELPER FUNCTIONS ============
+def calculate_gpa_server(subjects):
+    """Server-side GPA calculation"""
+    from gpa_engine import GRADE_SCALE
+
+    total_credits = 0
+    total_grade_points = 0
+    subjects_with_grades = 0
+    subjects_without_grades = 0
+    
+    for subject in subjects:
+        grade = subject.get('grade', '')
+        credits = subject.get('credits', 0)
+        
+        if grade and grade in GRADE_SCALE:
+            grade_points = GRADE_SCALE[grade]
+            subject_grade_points = credits * grade_points
+            
+            total_credits += credits
+            total_grade_points += subject_grade_points
+            subjects_with_grades += 1
+        else:
+            subjects_without_grades += 1
+    
+    gpa = total_grade_points / total_credits if total_credits > 0 else 0
+    
+    return {
+        'total_credits': total_credits,
+        'total_grade_points': total_grade_points,
+        'gpa': gpa,
+        'subjects_with_grades': subjects_with_grades,
+        'subjects_without_grades': subjects_without_grades,
+        'total_subjects': len(subjects)
+    }
+
+def calculate_cgpa_server(history):
+    """Server-side CGPA calculation"""
+    if not history:
+        return 0.0
+    
+    total_cumulative_credits = 0
+    total_cumulative_grade_points = 0
+    
+    for semester in history:
+        total_cumulative_credits += semester.get('total_credits', 0)
+        total_cumulative_grade_points += semester.get('total_grade_points', 0)
+    
+    cgpa = total_cumulative_grade_points / total_cumulative_credits if total_cumulative_credits > 0 else 0
+    return cgpa
+
+# ============ CALCULATOR ROUTE ============
+@bp.route('/trackademic/calculator', methods=['GET', 'POST'])
+def calculator():
+    """Trackademic GPA Calculator - Server-side version"""
+    from gpa_engine import GRADE_SCALE
+
+    if 'user_id' not in session:
+        return redirect('/login')
+    
+    user_id = session['user_id']
+    
+    # Make session variables user-specific
+    current_trimester_key = f'calculator_current_trimester_{user_id}'
+    current_subjects_key = f'calculator_current_subjects_{user_id}'
+    
+    # Check if we need to clear old session data from other users
+    for key in list(session.keys()):
+        if key.startswith('calculator_') and not key.endswith(str(user_id)):
+            # This is session data from a different user, remove it
+            session.pop(key, None)
+    
+    # Initialize session variables if they don't exist
+    if current_trimester_key not in session:
+        session[current_trimester_key] = 1
+    if current_subjects_key not in session:
+        session[current_subjects_key] = []
+    
+    # REMOVE: Session-based CGPA history storage
+    # We'll load from database instead
+
+    # Get current state from session
+    current_trimester = session.get(current_trimester_key, 1)
+    current_subjects = session.get(current_subjects_key, [])
+    
+    # NEW: Load CGPA history from database instead of session
+    cgpa_history = []
+    try:
+        # Find trackademic user ID
+        conn = get_db_connection()
+        trackademic_user_id = current_trackademic_user_id(conn)
+        
+        if trackademic_user_id:
+            # Get GPA history from database
+            gpa_records = conn.execute('''
+                SELECT gpa_id as id, 
+                       trimester, 
+                       gpa,
+                       total_credits,
+                       total_grade_points,
+                       created_at as date
+                FROM gpa 
+                WHERE user_id = ?
+                ORDER BY trimester
+            ''', (trackademic_user_id,)).fetchall()
+        
+            # Convert database records to CGPA history format
+            for record in gpa_records:
+                # Extract trimester number from trimester name
+                trimester_name = record['trimester']
+                trimester_number = 1
+                if ' ' in trimester_name:
+                    try:
+                        trimester_number = int(trimester_name.split()[1])
+                    except:
+                        pass
+            
+                cgpa_history.append({
+                    'semester': trimester_name,
+                    'trimester_number': trimester_number,
+                    'date': record['date'] or datetime.datetime.now().strftime('%Y-%m-%d'),
+                    'gpa': float(record['gpa']),
+                    'total_credits': record['total_credits'] or 0,
+                    'total_grade_points': record['total_grade_points'] or 0,
+                    'subjects': []  # Subjects not stored in database, but we don't need them for display
+                })
+        
+        conn.close()
+    except Exception as e:
+        print(f"Error loading CGPA history from database: {e}")
+    
+    # Handle POST requests
+    if request.method == 'POST':
+        action = request.form.get('action')
+        
+        if action == 'change_trimester':
+            new_trimester = request.form.get('current_trimester')
+            if new_trimester and new_trimester.isdigit():
+                new_trimester = int(new_trimester)
+                if new_trimester != current_trimester:
+                    session[current_trimester_key] = new_trimester
+                    session[current_subjects_key] = []
+                    return redirect('/trackademic/calculator')
+        
+        elif action == 'add_subject':
+            subject_id = request.form.get('subject_to_add')
+            if subject_id:
+                subject_id = int(subject_id)
+                subject_data = get_subject_catalog().calculator_by_id.get(subject_id)
+                
+                if subject_data:
+                    # Check if subject already exists in current trimester
+                    existing_ids = [s['id'] for s in current_subjects]
+                    if subject_id not in existing_ids:
+                        subject_with_grade = {
+                            'id': subject_data['id'],
+                            'name': subject_data['name'],
+                            'code': subject_data['code'],
+                            'credits': subject_data['credits'],
+                            'grade': '',
+                            'trimester': current_trimester
+                        }
+                        current_subjects.append(subject_with_grade)
+                        session[current_subjects_key] = current_subjects
+        
+        elif action.startswith('remove_subject_'):
+            try:
+                subject_id = int(action.split('_')[-1])
+                current_subjects = [s for s in current_subjects if s['id'] != subject_id]
+                session[current_subjects_key] = current_subjects
+            except (IndexError, ValueError):
+                pass
+        
+        elif action.startswith('update_grade_'):
+            try:
+                subject_id = int(action.split('_')[-1])
+                grade = request.form.get(f'grade_{subject_id}', '')
+                
+                # Update the grade in current_subjects
+                for subject in current_subjects:
+                    if subject['id'] == subject_id:
+                        subject['grade'] = grade
+                        break
+                session[current_subjects_key] = current_subjects
+            except (IndexError, ValueError):
+                pass
+        
+        elif action == 'save_trimester':
+            # Calculate current GPA
+            current_gpa_data = calculate_gpa_server(current_subjects)
+
+            # Check if all subjects have grades
+            if current_gpa_data['subjects_without_grades'] == 0 and current_subjects:
+                # Prepare semester data
+                semester_data = {
+                    'semester': f'Trimester {current_trimester}',
+                    'trimester_number': current_trimester,
+                    'date': datetime.datetime.now().strftime('%Y-%m-%d'),
+                    'total_credits': current_gpa_data['total_credits'],
+                    'total_grade_points': current_gpa_data['total_grade_points'],
+                    'gpa': current_gpa_data['gpa'],
+                    'subjects': current_subjects.copy()
+                }
+        
+                # Also save to database with user_id
+                try:
+                    # Get the correct user_id for trackademic database
+                    conn = get_db_connection()
+    
+                    # Find (or create) the trackademic account of the logged-in user
+                    user_id = current_trackademic_user_id(conn, create=True)
+                    if not user_id:
+                        raise ValueError('Could not find or create trackademic user record')
+
+                    # Now save the GPA data with the correct user_id
+                    trimester_name = f'Trimester {current_trimester}'
+
+                    # Check if trimester already exists for this user
+                    existing = conn.execute(
+                        'SELECT * FROM gpa WHERE user_id = ? AND trimester = ?',
+                        (user_id, trimester_name)
+                    ).fetchone()
+
+                    if existing:
+                        # Update existing
+                        conn.execute(
+                            '''UPDATE gpa 
+                               SET gpa = ?, total_credits = ?, total_grade_points = ?, created_at = CURRENT_TIMESTAMP 
+                               WHERE user_id = ? AND trimester = ?''',
+                            (current_gpa_data['gpa'], current_gpa_data['total_credits'], 
+                             current_gpa_data['total_grade_points'], user_id, trimester_name)
+                        )
+                        action_msg = 'updated'
+                    else:
+                        # Insert new
+                        conn.execute(
+                            '''INSERT INTO gpa (user_id, trimester, gpa, total_credits, total_grade_points) 
+                               VALUES (?, ?, ?, ?, ?)''',
+                            (user_id, trimester_name, current_gpa_data['gpa'], 
+                             current_gpa_data['total_credits'], current_gpa_data['total_grade_points'])
+                        )
+                        action_msg = 'saved'
+
+                    conn.commit()
+                    print(f"GPA saved for user_id={user_id}, trimester={trimester_name}, GPA={current_gpa_data['gpa']:.2f}")
+
+                    # Reload CGPA history from database after saving
+                    # Get updated history
+                    gpa_records = conn.execute('''
+                        SELECT gpa_id as id, 
+                               trimester, 
+                               gpa,
+                               total_credits,
+                               total_grade_points,
+                               created_at as date
+                        FROM gpa 
+                        WHERE user_id = ?
+                        ORDER BY trimester
+                    ''', (user_id,)).fetchall()
+                    
+                    # Update cgpa_history with fresh data from database
+                    cgpa_history.clear()
+                    for record in gpa_records:
+                        trimester_name = record['trimester']
+                        trimester_number = 1
+                        if ' ' in trimester_name:
+                            try:
+                                trimester_number = int(trimester_name.split()[1])
+                            except:
+                                pass
+                        
+                        cgpa_history.append({
+                            'semester': trimester_name,
+                            'trimester_number': trimester_number,
+                            'date': record['date'] or datetime.datetime.now().strftime('%Y-%m-%d'),
+                            'gpa': float(record['gpa']),
+                            'total_credits': record['total_credits'] or 0,
+                            'total_grade_points': record['total_grade_points'] or 0,
+                            'subjects': []
+                        })
+
+                except Exception as e:
+                    print(f"Error saving GPA to database: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    action_msg = 'error'
+                finally:
+                    if 'conn' in locals():
+                        conn.close()
+
+                # Only reset and advance if save was successful
+                if action_msg in ['saved', 'updated']:
+                    # Reset current trimester and advance to next
+                    session[current_subjects_key] = []
+                    if current_trimester < 6:
+                        session[current_trimester_key] = current_trimester + 1
+
+                    flash(f'Trimester {current_trimester} {action_msg} successfully! GPA: {current_gpa_data["gpa"]:.2f}', 'success')
+                else:
+                    flash(f'Error saving trimester {current_trimester}. Please try again.', 'error')
+                    
+                return redirect('/trackademic/calculator')
+            else:
+                flash('Please select grades for all subjects before saving.', 'error')
+
+        elif action == 'reset_trimester':
+            session[current_subjects_key] = []
+        
+        elif action == 'clear_history':
+            # NEW: Clear history from database instead of session
+            try:
+                # Find trackademic user ID
+                conn = get_db_connection()
+                trackademic_user_id = current_trackademic_user_id(conn)
+                
+                if trackademic_user_id:
+                    # Delete all GPA records for this user
+                    conn.execute(
+                        'DELETE FROM gpa WHERE user_id = ?',
+                        (trackademic_user_id,)
+                    )
+                    conn.commit()
+                        
+                conn.close()
+                cgpa_history = []  # Clear local history
+                flash('All CGPA history has been cleared.', 'success')
+            except Exception as e:
+                print(f"Error clearing history from database: {e}")
+                flash('Error clearing history. Please try again.', 'error')
+        
+        elif action.startswith('remove_history_'):
+            try:
+                trimester_number = int(action.split('_')[-1])
+                # NEW: Remove from database instead of session
+                try:
+                    # Find trackademic user ID
+                    conn = get_db_connection()
+                    trackademic_user_id = current_trackademic_user_id(conn)
+                    
+                    if trackademic_user_id:
+                        # Delete specific trimester
+                        trimester_name = f'Trimester {trimester_number}'
+                        conn.execute(
+                            'DELETE FROM gpa WHERE user_id = ? AND trimester = ?',
+                            (trackademic_user_id, trimester_name)
+                        )
+                        conn.commit()
+                        
+                        # Update local history
+                        cgpa_history = [s for s in cgpa_history if s['trimester_number'] != trimester_number]
+                    
+                    conn.close()
+                    flash(f'Trimester {trimester_number} removed from history.', 'success')
+                except Exception as e:
+                    print(f"Error removing history from database: {e}")
+                    flash('Error removing trimester. Please try again.', 'error')
+            except (IndexError, ValueError):
+                pass
+        
+        # Refresh current values after POST (except CGPA history which comes from DB)
+        current_trimester = session.get(current_trimester_key, 1)
+        current_subjects = session.get(current_subjects_key, [])
+    
+    # Get all subjects for the dropdown
+    all_subjects = get_subject_catalog().calculator_subjects
+    
+    # Calculate current GPA
+    current_gpa_data = calculate_gpa_server(current_subjects)
+    
+    # Overall CGPA from the running totals, which include any change made above
+    overall_cgpa = 0.0
+    try:
+        conn = get_db_connection()
+        trackademic_user_id = current_trackademic_user_id(conn)
+        if trackademic_user_id:
+            overall_cgpa = get_cgpa(conn, trackademic_user_id)
+        conn.close()
+    except Exception as e:
+        print(f"Error loading CGPA totals: {e}")
+    
+    # Render the calculator template with all data
+    return render_template('Calculator.html',
+                         all_subjects=all_subjects,
+                         current_trimester=current_trimester,
+                         current_subjects=current_subjects,
+                         grade_scale=GRADE_SCALE,
+                         current_gpa_data=current_gpa_data,
+                         cgpa_history=cgpa_history,
+                         overall_cgpa=overall_cgpa,
+                         app_mode='trackademic')
@@ -0,0 +1,95 @@
+"""GPA inspection pages for development; only registered when debug routes are enabled"""
+from flask import Blueprint, session
+
+from admin_tables import TablePage, stream_table
+from db import get_db_connection
+
+bp = Blueprint('debug', __name__)
+
+GPA_SORTS = {
+    'id': ('g.gpa_id',),
+    'user': ('g.user_id', 'g.trimester'),
+    'trimester': ('g.trimester', 'g.user_id'),
+    'gpa': ('g.gpa', 'g.gpa_id'),
+    'credits': ('g.total_credits', 'g.gpa_id'),
+    'created': ('g.created_at', 'g.gpa_id'),
+}
+
+GPA_COLUMNS = [('ID', 'id'), ('User ID', 'user'), ('Username', None), ('Trimester', 'trimester'),
+               ('GPA', 'gpa'), ('Credits', 'credits')]
+
+
+def count_gpa_records(conn):
+    """Number of gpa rows, read from the per-trimester aggregates instead of a table scan"""
+    return conn.execute('SELECT COALESCE(SUM(records), 0) FROM gpa_trimester_stats').fetchone()[0]
+
+
+def gpa_cells(gpa):
+    return (gpa['gpa_id'], gpa['user_id'], gpa['username'] or 'N/A', gpa['trimester'],
+            f'{gpa["gpa"]:.2f}', gpa['total_credits'])
+
+
+@bp.route('/debug/gpa-data')
+def debug_gpa_data():
+    """Debug endpoint to check all GPA data in database"""
+    if 'is_admin' not in session or session['is_admin'] != 1:
+        return "Admin access required", 403
+    
+    page = TablePage(GPA_SORTS, 'user')
+    conn = get_db_connection()
+    total = count_gpa_records(conn)
+    all_gpa = page.rows(conn, '''
+        SELECT g.*, u.username, u.email 
+        FROM gpa g 
+        LEFT JOIN trackademic_users u ON g.user_id = u.user_id
+    ''')
+    
+    return stream_table('All GPA Data in Database', [{
+        'before': f'Total records: {total}',
+        'columns': GPA_COLUMNS + [('Email', None), ('Created', 'created')],
+        'rows': ((gpa_cells(gpa) + (gpa['email'] or 'N/A', gpa['created_at']), None) for gpa in all_gpa),
+        'page': page,
+    }], footer_links=[('Back to Admin', '/admin/home')])
+
+@bp.route('/debug/user-gpa')
+def debug_user_gpa():
+    """Debug endpoint to check GPA data for current user"""
+    if 'user_id' not in session:
+        return "Not authenticated", 401
+    
+    user_id = session['user_id']
+    page = TablePage(GPA_SORTS, 'user')
+    conn = get_db_connection()
+    
+    # Current user's GPA data: one row per trimester, so it is read in full
+    user_gpa = conn.execute('''
+        SELECT g.*, u.username 
+        FROM gpa g 
+        JOIN trackademic_users u ON g.user_id = u.user_id
+        WHERE g.user_id = ?
+        ORDER BY g.trimester
+    ''', (user_id,)).fetchall()
+    total = count_gpa_records(conn)
+    
+    # All GPA data for comparison, a page at a time
+    all_gpa = page.rows(conn, '''
+        SELECT g.*, u.username 
+        FROM gpa g 
+        JOIN trackademic_users u ON g.user_id = u.user_id
+    ''')
+    
+    return stream_table(f'GPA Data for User ID: {user_id}', [
+        {
+            'heading': 'Your GPA Data:',
+            'columns': GPA_COLUMNS,
+            'rows': [(gpa_cells(gpa), None) for gpa in user_gpa],
+            'empty': 'No GPA data found for your account.',
+        },
+        {
+            'heading': 'All GPA Data in Database (for comparison):',
+            'before': f'Total records: {total}',
+            'columns': GPA_COLUMNS,
+            'rows': ((gpa_cells(gpa), None) for gpa in all_gpa),
+            'page': page,
+        },
+    ], footer_links=[('Back to Calculator', '/trackademic/calculator')])
@@ -0,0 +1,125 @@
+"""Notes API: per-subject and per-user listings, uploads and streamed downloads"""
+import mimetypes
+
+from flask import Blueprint, Response, jsonify, request, session
+
+from catalog import get_subject_catalog
+from db import TRACKADEMIC_DB, connect, get_db_connection
+from identity import current_trackademic_user_id
+from notes_store import DEFAULT_PAGE_SIZE, iter_note_file, list_notes, write_note_file
+from social_feed import page_size
+
+bp = Blueprint('notes', __name__)
+
+def note_to_json(note, catalog):
+    subject = catalog.by_id.get(note['subject_id'])
+    return {
+        'note_id': note['note_id'],
+        'subject_id': note['subject_id'],
+        'subject_code': subject['subject_code'] if subject else None,
+        'subject_name': subject['subject_name'] if subject else None,
+        'user_id': note['user_id'],
+        'file_name': note['file_name'],
+        'size': note['size'],
+        'download_url': f"/api/notes/{note['note_id']}/download",
+    }
+
+# ============ NOTES ENDPOINTS ============
+@bp.route('/api/notes', methods=['GET'])
+def api_list_notes():
+    """List notes for ?subject_id=, ?user_id= or both (user_id=me for your own), newest first"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not authenticated'}), 401
+
+    subject_id = request.args.get('subject_id', type=int)
+    user_id = request.args.get('user_id', type=int)
+    conn = get_db_connection()
+    try:
+        if request.args.get('user_id') == 'me':
+            user_id = current_trackademic_user_id(conn)
+            if user_id is None:
+                return jsonify({'success': True, 'notes': [], 'next_cursor': None})
+        if subject_id is None and user_id is None:
+            return jsonify({'success': False, 'error': 'subject_id or user_id is required'}), 400
+
+        notes, next_cursor = list_notes(
+            conn, subject_id, user_id,
+            before=request.args.get('before', type=int),
+            limit=page_size(request.args.get('limit', type=int), DEFAULT_PAGE_SIZE)
+        )
+    finally:
+        conn.close()
+
+    catalog = get_subject_catalog()
+    return jsonify({
+        'success': True,
+        'notes': [note_to_json(note, catalog) for note in notes],
+        'next_cursor': next_cursor,
+    })
+
+@bp.route('/api/notes', methods=['POST'])
+def api_upload_note():
+    """Upload a file as a note for a subject (multipart: subject_id, file)"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not authenticated'}), 401
+
+    subject_id = request.form.get('subject_id', type=int)
+    file = request.files.get('file')
+    if subject_id not in get_subject_catalog().by_id:
+        return jsonify({'success': False, 'error': 'Unknown subject'}), 400
+    if not file or not file.filename:
+        return jsonify({'success': False, 'error': 'No file provided'}), 400
+
+    conn = get_db_connection()
+    try:
+        user_id = current_trackademic_user_id(conn, create=True)
+        if not user_id:
+            return jsonify({'success': False, 'error': 'Could not find or create user account'}), 500
+
+        note_id = conn.execute(
+            'INSERT INTO notes (subject_id, user_id, file_name) VALUES (?, ?, ?)',
+            (subject_id, user_id, file.filename)
+        ).lastrowid
+        write_note_file(conn, note_id, file.stream)
+        conn.commit()
+        note = conn.execute('SELECT note_id, subject_id, user_id, file_name, size FROM notes WHERE note_id = ?',
+                            (note_id,)).fetchone()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error saving note: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    finally:
+        conn.close()
+
+    return jsonify({'success': True, 'note': note_to_json(note, get_subject_catalog())}), 201
+
+@bp.route('/api/notes/<int:note_id>/download', methods=['GET'])
+def api_download_note(note_id):
+    """Stream a note's file from its chunks without loading it whole"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not authenticated'}), 401
+
+    # A connection of its own, so a slow download does not hold one of the pool's;
+    # the read transaction keeps the size and chunks consistent if the note is rewritten meanwhile
+    conn = connect(TRACKADEMIC_DB)
+    conn.execute('BEGIN')
+    note = conn.execute('SELECT file_name, size FROM notes WHERE note_id = ?', (note_id,)).fetchone()
+    if note is None:
+        conn.close()
+        return jsonify({'success': False, 'error': 'Note not found'}), 404
+
+    def generate():
+        try:
+            yield from iter_note_file(conn, note_id)
+        finally:
+            conn.close()
+
+    response = Response(
+        generate(),
+        mimetype=mimetypes.guess_type(note['file_name'])[0] or 'application/octet-stream'
+    )
+    if note['size'] is not None:
+        response.content_length = note['size']
+    response.headers.set('Content-Disposition', 'attachment', filename=note['file_name'])
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    return response
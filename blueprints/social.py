@@ -0,0 +1,256 @@
+"""Social platform: feed, posts, comments, saved posts, uploaded files and their JSON endpoints"""
+import mimetypes
+
+from flask import Blueprint, current_app, jsonify, redirect, render_template, request, send_from_directory, session
+
+from blobstore import is_content_addressed, release_blob, remove_blob_file, store_upload
+from db import get_social_db_connection
+from social_feed import feed_to_json, load_feed, load_saved_posts, page_size
+from thumbnails import discard_thumbnails, schedule_thumbnail
+
+bp = Blueprint('social', __name__)
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# ============ SOCIAL APP ROUTES ============
+@bp.route('/social/dashboard', methods=['GET', 'POST'])
+def social_dashboard():
+    """Social platform dashboard"""
+    if "user_id" not in session:
+        return redirect("/login")
+    
+    if session.get('app_mode') != 'social':
+        session['app_mode'] = 'social'
+    
+    user_id = session["user_id"]
+    username = session["username"]
+    search_query = request.args.get('search', '')
+
+    if request.method == "POST":
+        content = request.form.get("content")
+        file = request.files.get("file")
+        filename = original_filename = None
+        db = get_social_db_connection()
+        try:
+            if file and file.filename:
+                original_filename = file.filename
+                filename = store_upload(db, file, current_app.config['UPLOAD_FOLDER'])
+            db.execute("INSERT INTO posts (user_id, content, filename, original_filename) VALUES (?, ?, ?, ?)",
+                       (user_id, content, filename, original_filename))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        schedule_thumbnail(current_app.config['UPLOAD_FOLDER'], filename)
+        return redirect("/social/dashboard")
+
+    db = get_social_db_connection()
+    
+    # Get folders
+    cursor = db.execute("""
+        SELECT DISTINCT folders.id, folders.folder_name 
+        FROM folders 
+        JOIN saved_posts ON folders.id = saved_posts.folder_id 
+        WHERE folders.user_id=?
+    """, (user_id,))
+    folders = cursor.fetchall()
+
+    # Get one page of posts with their comments
+    posts_with_comments, next_cursor = load_feed(
+        db, user_id, search_query,
+        before=request.args.get('before', type=int),
+        limit=page_size(request.args.get('limit', type=int), current_app.config['FEED_PAGE_SIZE'])
+    )
+
+    db.close()
+    
+    return render_template("dashboard.html", 
+                         username=username, 
+                         posts=posts_with_comments, 
+                         folders=folders, 
+                         search_query=search_query,
+                         next_cursor=next_cursor,
+                         app_mode='social')
+
+@bp.route('/api/social/feed', methods=['GET'])
+def api_social_feed():
+    """API endpoint for infinite scroll: one page of the feed after the ?before= cursor"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not authenticated'}), 401
+    
+    try:
+        db = get_social_db_connection()
+        posts, next_cursor = load_feed(
+            db, session['user_id'], request.args.get('search', ''),
+            before=request.args.get('before', type=int),
+            limit=page_size(request.args.get('limit', type=int), current_app.config['FEED_PAGE_SIZE'])
+        )
+        db.close()
+        
+        return jsonify({
+            'success': True,
+            'posts': feed_to_json(posts),
+            'next_cursor': next_cursor
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@bp.route('/api/social/search', methods=['GET'])
+def api_social_search():
+    """API endpoint for ranked full-text search over posts and comments"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not authenticated'}), 401
+    
+    from search import search_comments, search_posts
+
+    try:
+        query = request.args.get('q', '')
+        limit = page_size(request.args.get('limit', type=int), current_app.config['FEED_PAGE_SIZE'])
+        db = get_social_db_connection()
+        posts = search_posts(db, query, limit)
+        comments = search_comments(db, query, limit)
+        db.close()
+        
+        return jsonify({
+            'success': True,
+            'posts': posts,
+            'comments': comments
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@bp.route("/social/save_post/<int:post_id>", methods=["POST"])
+def save_post(post_id):
+    if "user_id" not in session: return redirect("/login")
+    user_id = session["user_id"]
+    folder_id = request.form.get("folder_id")
+    new_folder_name = request.form.get("new_folder_name")
+
+    db = get_social_db_connection()
+    if new_folder_name and new_folder_name.strip():
+        cursor = db.execute("INSERT INTO folders (user_id, folder_name) VALUES (?, ?)", 
+                            (user_id, new_folder_name.strip()))
+        folder_id = cursor.lastrowid
+    
+    if folder_id:
+        db.execute("INSERT INTO saved_posts (user_id, post_id, folder_id) VALUES (?, ?, ?)", 
+                   (user_id, post_id, folder_id))
+        db.commit()
+    db.close()
+    return redirect("/social/dashboard")
+
+@bp.route("/social/saved")
+def saved_posts():
+    if "user_id" not in session: return redirect("/login")
+    user_id = session["user_id"]
+    search_query = request.args.get('search', '')
+    db = get_social_db_connection()
+    organized, next_cursor = load_saved_posts(
+        db, user_id, search_query,
+        before=request.args.get('before', type=int),
+        limit=page_size(request.args.get('limit', type=int), current_app.config['FEED_PAGE_SIZE'])
+    )
+    db.close()
+    return render_template("saved.html", organized=organized, username=session["username"], search_query=search_query, next_cursor=next_cursor, app_mode='social')
+
+@bp.route("/social/unsave/<int:sp_id>", methods=["POST"])
+def unsave(sp_id):
+    if "user_id" not in session: return redirect("/login")
+    user_id = session["user_id"]
+    db = get_social_db_connection()
+    
+    # Check if folder becomes empty after deletion
+    cursor = db.execute("SELECT folder_id FROM saved_posts WHERE id=? AND user_id=?", (sp_id, user_id))
+    result = cursor.fetchone()
+    
+    if result:
+        folder_id = result[0]
+        db.execute("DELETE FROM saved_posts WHERE id=? AND user_id=?", (sp_id, user_id))
+        
+        # Check if any posts are still in this folder
+        check = db.execute("SELECT COUNT(*) FROM saved_posts WHERE folder_id=?", (folder_id,)).fetchone()
+        if check[0] == 0:
+            # Delete the folder if it's empty
+            db.execute("DELETE FROM folders WHERE id=?", (folder_id,))
+            
+    db.commit()
+    db.close()
+    return redirect("/social/saved")
+
+@bp.route("/social/delete_post/<int:post_id>", methods=["POST"])
+def delete_post(post_id):
+    if "user_id" not in session: return redirect("/login")
+    user_id = session["user_id"]
+    db = get_social_db_connection()
+    cursor = db.execute("SELECT filename FROM posts WHERE id=? AND user_id=?", (post_id, user_id))
+    result = cursor.fetchone()
+    unreferenced = False
+    if result:
+        filename = result[0]
+        db.execute("DELETE FROM posts WHERE id=? AND user_id=?", (post_id, user_id))
+        db.execute("DELETE FROM comments WHERE post_id=?", (post_id,))
+        db.execute("DELETE FROM saved_posts WHERE post_id=?", (post_id,))
+        unreferenced = bool(filename) and release_blob(db, filename)
+    db.commit()
+    # Files go only after the rows are gone for good
+    if unreferenced and remove_blob_file(db, filename, current_app.config['UPLOAD_FOLDER']):
+        discard_thumbnails(current_app.config['UPLOAD_FOLDER'], filename)
+    db.close()
+    return redirect("/social/dashboard")
+
+@bp.route("/social/comment/<int:post_id>", methods=["POST"])
+def add_comment(post_id):
+    if "user_id" not in session: return redirect("/login")
+    comment_text = request.form.get("comment")
+    if comment_text:
+        db = get_social_db_connection()
+        db.execute("INSERT INTO comments (post_id, user_id, username, comment) VALUES (?, ?, ?, ?)",
+                   (post_id, session["user_id"], session["username"], comment_text))
+        db.commit()
+        db.close()
+    return redirect("/social/dashboard")
+
+@bp.route("/social/delete_comment/<int:comment_id>", methods=["POST"])
+def delete_comment(comment_id):
+    if "user_id" not in session: return redirect("/login")
+    db = get_social_db_connection()
+    cursor = db.execute("SELECT user_id FROM comments WHERE id=?", (comment_id,))
+    result = cursor.fetchone()
+    if result and result[0] == session["user_id"]:
+        db.execute("DELETE FROM comments WHERE id=?", (comment_id,))
+        db.commit()
+    db.close()
+    return redirect("/social/dashboard")
+
+# ============ UPLOADED FILES ============
+@bp.route('/uploads/<path:filename>')
+def uploaded_file(filename):
+    """Serve an uploaded file, with Range and conditional request support.
+
+    ``?name=`` sets the filename the browser shows or saves as. The body
+    is handed to the server's file wrapper (or X-Sendfile when
+    USE_X_SENDFILE is on) rather than read into Python.
+    """
+    # The type comes from the stored name, never from ?name=
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = send_from_directory(
+        current_app.config['UPLOAD_FOLDER'], filename,
+        mimetype=mimetype,
+        download_name=request.args.get('name') or None,
+        max_age=IMMUTABLE_MAX_AGE if is_content_addressed(filename) else 0,
+    )
+    if is_content_addressed(filename):
+        response.cache_control.immutable = True
+    else:
+        # Files saved before the blob store can be overwritten in place
+        response.cache_control.no_cache = True
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    return response
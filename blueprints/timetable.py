@@ -0,0 +1,426 @@
+"""Trackademic home and the weekly timetable"""
+import datetime
+import time
+
+from flask import Blueprint, flash, redirect, render_template, request, session
+
+from catalog import CUSTOM_SUBJECT_PREFIX, get_subject_catalog
+from db import get_db_connection
+from tasks import (OVERLAPPING_SLOT, WEEK_CACHE, WEEK_QUERY, WEEK_VERSION, clear_completion, forget_week,
+                   parse_time_slot, starts_on_slot, time_to_minutes, toggle_completion, week_start)
+
+bp = Blueprint('timetable', __name__)
+
+@bp.route('/trackademic')
+def trackademic_home():
+    """Trackademic home page for regular users"""
+    if 'user_id' not in session:
+        return redirect('/login')
+    
+    # If admin, redirect to admin home
+    if 'is_admin' in session and session['is_admin'] == 1:
+        return redirect('/admin/home')
+    
+    if session.get('app_mode') != 'trackademic':
+        session['app_mode'] = 'trackademic'
+    
+    return '''
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Trackademic Home</title>
+        <link rel="stylesheet" href="/static/home-styles.css">
+    </head>
+    <body class="trackademic-body trackademic-home">  <!-- Added trackademic-home class here -->
+        <div class="home-container">
+            <div class="home-header">
+                <h1>Trackademic</h1>
+                <p>Study Planner & GPA Calculator</p>
+            </div>
+            
+            <div class="welcome-section">
+                <h2>Welcome back, ''' + session.get('username', 'Student') + '''!</h2>
+                <p>Manage your academic schedule, calculate your GPA, and organize your notes in one place.</p>
+            </div>
+            
+            <div class="apps-grid">
+                <a href="/trackademic/timetable" class="app-card">
+                    <div class="app-icon">📅</div>
+                    <h3>Timetable</h3>
+                    <p>View and manage your weekly class schedule and tasks</p>
+                </a>
+                
+                <a href="/trackademic/calculator" class="app-card">
+                    <div class="app-icon">🧮</div>
+                    <h3>GPA Calculator</h3>
+                    <p>Calculate your GPA and track your academic performance</p>
+                </a>
+                
+                <a href="/social/dashboard" class="app-card">
+                    <div class="app-icon">👥</div>
+                    <h3>Social Dashboard</h3>
+                    <p>Connect with classmates and share resources</p>
+                </a>
+            </div>
+            
+            <div class="actions-section">
+                <a href="/logout" class="logout-btn">Logout</a>
+            </div>
+        </div>
+    </body>
+    </html>
+    '''
+
+# ============ TRACKADEMIC TIMETABLE ROUTES ============
+@bp.route('/trackademic/timetable')
+def timetable():
+    """View timetable in non-edit mode"""
+    if 'user_id' not in session:
+        return redirect('/login')
+    
+    user_id = session['user_id']
+    schedule, completed_tasks, today_schedule, weekly_summary = get_week(user_id)
+    
+    return render_template('timetable.html', schedule=schedule, edit_mode=False, 
+                          today_schedule=today_schedule, weekly_summary=weekly_summary,
+                          completed_tasks=completed_tasks, app_mode='trackademic')
+
+@bp.route('/trackademic/add_subject_form')
+def add_subject_form():
+    """Show form to add a subject to timetable - accessible to all users"""
+    if 'user_id' not in session:
+        return redirect('/login')
+    
+    day = int(request.args.get('day', 0))
+    
+    subjects = get_subject_catalog().subjects
+    
+    return render_template('add_subject.html', 
+                          subjects=subjects, 
+                          day=day,
+                          start_time=request.args.get('start_time', ''),
+                          end_time=request.args.get('end_time', ''),
+                          subject_id=request.args.get('subject_id', ''),
+                          task_description=request.args.get('task_description', ''),
+                          error_message=request.args.get('error_message', ''),
+                          app_mode='trackademic')
+
+@bp.route('/trackademic/add_timetable', methods=['POST'])
+def add_timetable():
+    """Add a subject to the timetable database"""
+    if 'user_id' not in session:  # Only check if user is logged in
+        return redirect('/login')
+    
+    user_id = session['user_id']
+    day = int(request.form.get('day', 0))
+    start_time = request.form.get('start_time', '').strip()
+    end_time = request.form.get('end_time', '').strip()
+    subject_id = request.form.get('subject_id', '')
+    custom_task = request.form.get('custom_task', '').strip()
+    task_description = request.form.get('task_description', '').strip()
+    
+    if not start_time or not end_time:
+        error_message = "Both start and end times are required!"
+        subjects = get_subject_catalog().subjects
+        
+        return render_template('add_subject.html', 
+                              subjects=subjects, 
+                              day=day,
+                              error_message=error_message,
+                              start_time=start_time,
+                              end_time=end_time,
+                              subject_id=subject_id,
+                              custom_task=custom_task,
+                              task_description=task_description,
+                              app_mode='trackademic')
+    
+    # Validate that end time is not earlier than start time
+    if not is_valid_time_range(start_time, end_time):
+        error_message = f"End time ({end_time}) cannot be earlier than or equal to start time ({start_time})."
+        subjects = get_subject_catalog().subjects
+        
+        return render_template('add_subject.html', 
+                              subjects=subjects, 
+                              day=day,
+                              error_message=error_message,
+                              start_time=start_time,
+                              end_time=end_time,
+                              subject_id=subject_id,
+                              custom_task=custom_task,
+                              task_description=task_description,
+                              app_mode='trackademic')
+    
+    # Completion bits are per half-hour slot, so two tasks may not share one
+    if not starts_on_slot(start_time):
+        error_message = f"Start time ({start_time}) must be on the hour or half hour."
+        subjects = get_subject_catalog().subjects
+        
+        return render_template('add_subject.html', 
+                              subjects=subjects, 
+                              day=day,
+                              error_message=error_message,
+                              start_time=start_time,
+                              end_time=end_time,
+                              subject_id=subject_id,
+                              custom_task=custom_task,
+                              task_description=task_description,
+                              app_mode='trackademic')
+    
+    # Handle custom task
+    if subject_id == 'custom':
+        if not custom_task:
+            error_message = "Please enter a task name for the custom task."
+            subjects = get_subject_catalog().subjects
+            
+            return render_template('add_subject.html', 
+                                  subjects=subjects, 
+                                  day=day,
+                                  error_message=error_message,
+                                  start_time=start_time,
+                                  end_time=end_time,
+                                  subject_id=subject_id,
+                                  custom_task=custom_task,
+                                  task_description=task_description,
+                                  app_mode='trackademic')
+        
+        # Create a temporary subject for the custom task
+        conn = get_db_connection()
+        try:
+            timestamp = int(time.time())
+            custom_code = f"{CUSTOM_SUBJECT_PREFIX}{timestamp}"
+            
+            conn.execute(
+                'INSERT INTO subjects (subject_name, subject_code) VALUES (?, ?)',
+                (custom_task, custom_code)
+            )
+            conn.commit()
+            
+            # Get the new subject_id
+            new_subject = conn.execute(
+                'SELECT subject_id FROM subjects WHERE subject_code = ?',
+                (custom_code,)
+            ).fetchone()
+            
+            subject_id = new_subject['subject_id']
+        except Exception as e:
+            conn.close()
+            error_message = f"Error creating custom task: {str(e)}"
+            subjects = get_subject_catalog().subjects
+            
+            return render_template('add_subject.html', 
+                                  subjects=subjects, 
+                                  day=day,
+                                  error_message=error_message,
+                                  start_time=start_time,
+                                  end_time=end_time,
+                                  subject_id=subject_id,
+                                  custom_task=custom_task,
+                                  task_description=task_description,
+                                  app_mode='trackademic')
+    else:
+        subject_id = int(subject_id)
+        conn = get_db_connection()  # Get connection for regular subjects
+    
+    # Combine start and end time into a single time slot string
+    time_slot = f"{start_time} - {end_time}"
+    start_minutes, end_minutes = parse_time_slot(time_slot)
+    
+    try:
+        # Check if the new slot overlaps one of the user's existing slots that day
+        existing = conn.execute(
+            OVERLAPPING_SLOT,
+            (user_id, day, end_minutes, start_minutes)
+        ).fetchone()
+        
+        if existing:
+            conn.close()
+            error_message = f"This time slot ({time_slot}) overlaps {existing['time_slot']}!"
+            
+            subjects = get_subject_catalog().subjects
+            
+            return render_template('add_subject.html', 
+                                  subjects=subjects, 
+                                  day=day,
+                                  error_message=error_message,
+                                  start_time=start_time,
+                                  end_time=end_time,
+                                  subject_id=subject_id,
+                                  custom_task=custom_task,
+                                  task_description=task_description,
+                                  app_mode='trackademic')
+        
+        # Insert into timetable WITH task_description
+        conn.execute(
+            'INSERT INTO timetable (subject_id, user_id, day, time_slot, start_minutes, end_minutes, task_description) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (subject_id, user_id, day, time_slot, start_minutes, end_minutes, task_description)
+    )
+        conn.commit()
+        conn.close()
+        forget_week(user_id)
+        
+        return redirect('/trackademic/edit_timetable')
+    
+    except Exception as e:
+        error_message = f"Error adding to timetable: {str(e)}"
+        subjects = get_subject_catalog().subjects
+        
+        return render_template('add_subject.html', 
+                              subjects=subjects, 
+                              day=day,
+                              error_message=error_message,
+                              start_time=start_time,
+                              end_time=end_time,
+                              subject_id=subject_id,
+                              custom_task=custom_task,
+                              task_description=task_description,
+                              app_mode='trackademic')
+    
+@bp.route('/trackademic/edit_timetable')
+def edit_timetable():
+    """Enter edit mode - accessible to all logged-in users"""
+    if 'user_id' not in session:
+        return redirect('/login')
+    
+    user_id = session['user_id']
+    subjects = get_subject_catalog().subjects
+    
+    schedule, completed_tasks, today_schedule, weekly_summary = get_week(user_id)
+
+    return render_template('timetable.html', subjects=subjects, schedule=schedule, 
+                          edit_mode=True, today_schedule=today_schedule, 
+                          weekly_summary=weekly_summary, completed_tasks=completed_tasks,
+                          app_mode='trackademic')
+
+def is_valid_time_range(start_time_str, end_time_str):
+    """Helper function to validate if end time is after start time"""
+    try:
+        start_minutes = time_to_minutes(start_time_str)
+        end_minutes = time_to_minutes(end_time_str)
+        
+        if start_minutes == -1 or end_minutes == -1:
+            return False
+            
+        return end_minutes > start_minutes
+    except Exception as e:
+        print(f"Time validation error: {e}")
+        return False
+
+@bp.route('/trackademic/remove_timetable', methods=['POST'])
+def remove_timetable():
+    """Remove a subject from timetable database - user can only remove their own"""
+    if 'user_id' not in session:
+        return redirect('/trackademic/timetable')
+    
+    user_id = session['user_id']
+    day = int(request.form.get('day', 0))
+    time = request.form.get('time', '')
+    
+    try:
+        conn = get_db_connection()
+        conn.execute(
+            'DELETE FROM timetable WHERE user_id = ? AND day = ? AND time_slot = ?',
+            (user_id, day, time)
+        )
+        clear_completion(conn, user_id, day, time)
+        conn.commit()
+        conn.close()
+        forget_week(user_id)
+        
+        return redirect('/trackademic/edit_timetable')
+    
+    except Exception as e:
+        return f'<h1>Error removing from timetable: {str(e)}</h1><p><a href="/trackademic/edit_timetable">Go back</a></p>'
+
+@bp.route('/trackademic/clear_timetable', methods=['POST'])
+def clear_timetable():
+    """Clear all timetable data for the current user"""
+    if 'user_id' not in session:
+        return redirect('/trackademic/timetable')
+    
+    user_id = session['user_id']
+    try:
+        conn = get_db_connection()
+        conn.execute('DELETE FROM timetable WHERE user_id = ?', (user_id,))
+        clear_completion(conn, user_id)
+        conn.commit()
+        conn.close()
+        forget_week(user_id)
+        
+        return redirect('/trackademic/edit_timetable')
+    
+    except Exception as e:
+        return f'<h1>Error clearing timetable: {str(e)}</h1><p><a href="/trackademic/edit_timetable">Go back</a></p>'
+    
+@bp.route('/trackademic/complete_task', methods=['POST'])
+def complete_task():
+    """Toggle a task between done and not done for this week (without removing it from the timetable)"""
+    if 'user_id' not in session:
+        return redirect('/login')
+    
+    user_id = session['user_id']
+    try:
+        day = int(request.form.get('day', 0))
+        time_slot = request.form.get('time_slot', '')
+        
+        conn = get_db_connection()
+        toggle_completion(conn, user_id, day, time_slot)
+        conn.close()
+        
+        return redirect('/trackademic/timetable')
+    
+    except Exception as e:
+        flash(f'Error completing task: {str(e)}', 'error')
+        return redirect('/trackademic/timetable')
+
+# ============ HELPER FUNCTIONS FOR TRACKADEMIC ============
+def load_week(conn, user_id, today=None):
+    """Load a user's week in one query and derive everything the timetable page shows.
+
+    Returns (schedule, completed_tasks, today_schedule, weekly_summary): the
+    day -> time_slot grid, the (day, time_slot) pairs done this week, and the
+    rows for the Today's Tasks and Week Overview lists.
+    """
+    if today is None:
+        today = datetime.datetime.today().weekday()
+    
+    week = conn.execute(WEEK_QUERY, (week_start(), user_id)).fetchall()
+    
+    schedule = {}
+    completed_tasks = set()
+    for item in week:
+        day = item['day']
+        time_slot = item['time_slot']
+        if day not in schedule:
+            schedule[day] = {}
+        if item['completed']:
+            completed_tasks.add((day, time_slot))
+        schedule[day][time_slot] = {
+            'subject_name': item['subject_name'],
+            'subject_code': item['subject_code'],
+            'time_slot': time_slot,
+            'task_description': item['task_description'],
+            'subject_id': item['subject_id'],
+            'timetable_id': item['timetable_id']
+        }
+    
+    today_schedule = [item for item in week if item['day'] == today]
+    return schedule, completed_tasks, today_schedule, week
+
+def get_week(user_id):
+    """load_week() through WEEK_CACHE; a repeat view costs one WEEK_VERSION read"""
+    today = datetime.datetime.today().weekday()
+    key = (user_id, week_start(), today)
+    conn = get_db_connection()
+    try:
+        # Read before loading, so a write in between costs one extra reload, never a stale page
+        version = tuple(conn.execute(WEEK_VERSION, (user_id,)).fetchone())
+        cached = WEEK_CACHE.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        week = load_week(conn, user_id, today)
+    finally:
+        conn.close()
+    WEEK_CACHE.set(key, (version, week))
+    return week
@@ -0,0 +1,88 @@
+"""In-process copy of the subjects catalog.
+
+Triggers on ``subjects`` bump ``catalog_version`` on every change. Readers
+check that counter, a primary key lookup, and only reload the table when it
+moved, so every worker picks up admin edits without re-reading an unchanged
+catalog on each request.
+
+Custom timetable tasks are stored as subjects too, one per task, with a
+``CUSTOM_`` code. They belong to one user's timetable, so they are left out
+of the catalog and do not bump its version; renaming one bumps only its
+owner's timetable_version.
+"""
+from db import get_db_connection
+
+CUSTOM_SUBJECT_PREFIX = 'CUSTOM_'
+
+CATALOG_QUERY = f"""
+    SELECT * FROM subjects
+    WHERE subject_code IS NULL OR subject_code NOT GLOB '{CUSTOM_SUBJECT_PREFIX}*'
+    ORDER BY subject_id
+"""
+
+CATALOG_VERSION_TRIGGERS = f"""
+DROP TRIGGER IF EXISTS subjects_version_insert;
+DROP TRIGGER IF EXISTS subjects_version_update;
+DROP TRIGGER IF EXISTS subjects_version_delete;
+
+CREATE TRIGGER subjects_version_insert AFTER INSERT ON subjects
+WHEN NEW.subject_code IS NULL OR NEW.subject_code NOT GLOB '{CUSTOM_SUBJECT_PREFIX}*' BEGIN
+    UPDATE catalog_version SET version = version + 1 WHERE name = 'subjects';
+END;
+CREATE TRIGGER subjects_version_update AFTER UPDATE ON subjects
+WHEN OLD.subject_code IS NULL OR OLD.subject_code NOT GLOB '{CUSTOM_SUBJECT_PREFIX}*'
+    OR NEW.subject_code IS NULL OR NEW.subject_code NOT GLOB '{CUSTOM_SUBJECT_PREFIX}*' BEGIN
+    UPDATE catalog_version SET version = version + 1 WHERE name = 'subjects';
+END;
+CREATE TRIGGER subjects_version_delete AFTER DELETE ON subjects
+WHEN OLD.subject_code IS NULL OR OLD.subject_code NOT GLOB '{CUSTOM_SUBJECT_PREFIX}*' BEGIN
+    UPDATE catalog_version SET version = version + 1 WHERE name = 'subjects';
+END;
+
+CREATE TRIGGER IF NOT EXISTS custom_subject_version_update AFTER UPDATE ON subjects
+WHEN NEW.subject_code GLOB '{CUSTOM_SUBJECT_PREFIX}*' BEGIN
+    UPDATE timetable_version SET version = version + 1
+    WHERE user_id IN (SELECT user_id FROM timetable WHERE subject_id = NEW.subject_id);
+END;
+"""
+
+_catalog = None
+
+
+class SubjectCatalog:
+    """Immutable snapshot of the subjects table with lookup indexes"""
+
+    def __init__(self, version, rows):
+        self.version = version
+        # Ordered by subject_id, as the timetable forms list them
+        self.subjects = tuple(rows)
+        self.by_id = {row['subject_id']: row for row in rows}
+        self.by_code = {row['subject_code']: row for row in rows if row['subject_code'] is not None}
+        # The calculator's shape, ordered by code like ORDER BY subject_code (NULLs first)
+        self.calculator_subjects = tuple(
+            {
+                'id': row['subject_id'],
+                'name': row['subject_name'],
+                'code': row['subject_code'],
+                'credits': row['credit_hours'],
+            }
+            for row in sorted(rows, key=lambda row: (row['subject_code'] is not None, row['subject_code'] or ''))
+        )
+        self.calculator_by_id = {subject['id']: subject for subject in self.calculator_subjects}
+
+
+def get_subject_catalog():
+    """Return the current catalog, reloading it only if subjects changed since the last load"""
+    global _catalog
+    conn = get_db_connection()
+    try:
+        version = conn.execute(
+            "SELECT version FROM catalog_version WHERE name = 'subjects'"
+        ).fetchone()['version']
+        catalog = _catalog
+        if catalog is None or catalog.version != version:
+            rows = conn.execute(CATALOG_QUERY).fetchall()
+            catalog = _catalog = SubjectCatalog(version, rows)
+    finally:
+        conn.close()
+    return catalog
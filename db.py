@@ -0,0 +1,258 @@
+import random
+import sqlite3
+import threading
+import time
+
+from flask import current_app, g, has_app_context
+
+TRACKADEMIC_DB = 'trackademic.db'
+SOCIAL_DB = 'social.db'
+
+# Applied to every new connection. WAL lets readers keep going while a
+# writer commits; NORMAL sync is durable across app crashes in WAL mode.
+STORAGE_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('mmap_size', 64 * 1024 * 1024),
+    ('cache_size', -16000),  # negative means KiB, so ~16 MB per connection
+    ('temp_store', 'MEMORY'),
+)
+
+# SQLite's own busy handler only waits this long before raising
+# "database is locked"; after that we back off and retry ourselves, for up
+# to BUSY_RETRY_BUDGET seconds in all (the 10 s timeout plain connections used).
+BUSY_TIMEOUT = 0.05
+BUSY_RETRY_BUDGET = 10.0
+BUSY_BACKOFF = 0.01
+BUSY_BACKOFF_MAX = 0.5
+
+
+def _is_busy(error):
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+def retry_on_busy(func, *args):
+    """Call func, retrying with bounded exponential backoff while the database is locked"""
+    deadline = time.monotonic() + BUSY_RETRY_BUDGET
+    delay = BUSY_BACKOFF
+    while True:
+        try:
+            return func(*args)
+        except sqlite3.OperationalError as e:
+            remaining = deadline - time.monotonic()
+            if not _is_busy(e) or remaining <= 0:
+                raise
+        time.sleep(min(delay + random.uniform(0, delay), remaining))
+        delay = min(delay * 2, BUSY_BACKOFF_MAX)
+
+
+class RetryingCursor(sqlite3.Cursor):
+    """Cursor whose statements are retried when the database is busy"""
+
+    def execute(self, sql, parameters=()):
+        return retry_on_busy(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        # A retry has to replay every row, so the iterable can't be one-shot
+        return retry_on_busy(super().executemany, sql, list(seq_of_parameters))
+
+
+class RetryingConnection(sqlite3.Connection):
+    """Connection that retries statements and commits when the database is busy"""
+
+    def cursor(self, factory=RetryingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        return retry_on_busy(super().commit)
+
+
+def configure_connection(conn, pragmas=STORAGE_PRAGMAS):
+    """Apply the storage PRAGMAs to a freshly opened connection"""
+    for name, value in pragmas:
+        conn.execute(f"PRAGMA {name} = {value}")
+    conn.execute("PRAGMA foreign_keys = ON")
+
+
+def connect(database, pragmas=STORAGE_PRAGMAS):
+    """Open a new SQLite connection with the settings every Trackademic connection uses"""
+    conn = sqlite3.connect(database, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                           factory=RetryingConnection)
+    conn.row_factory = sqlite3.Row
+    configure_connection(conn, pragmas)
+    return conn
+
+
+class ConnectionPool:
+    """Bounded pool of reusable connections to a single database file.
+
+    At most ``max_size`` connections are open at once; when all of them are
+    handed out, acquire() waits up to ``timeout`` seconds for one to come
+    back and then raises sqlite3.OperationalError. A connection is handed to
+    one request at a time, so it can safely move between worker threads.
+    Idle connections are health-checked before reuse if they have been
+    sitting longer than ``health_check_interval`` seconds.
+    """
+
+    def __init__(self, database, max_size=5, health_check_interval=30.0, timeout=10.0):
+        self.database = database
+        self.max_size = max_size
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self._idle = []
+        self._open = 0
+        self._available = threading.Condition(threading.Lock())
+
+    def acquire(self):
+        """Take an idle connection from the pool, open a new one if under max_size, or wait"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._available:
+                while not self._idle and self._open >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise sqlite3.OperationalError(
+                            f"No free connection to {self.database} after {self.timeout}s"
+                        )
+                    self._available.wait(remaining)
+                if self._idle:
+                    conn, last_checked = self._idle.pop()
+                else:
+                    conn = None
+                    self._open += 1
+
+            if conn is None:
+                try:
+                    return connect(self.database)
+                except BaseException:
+                    self._forget()
+                    raise
+            if time.monotonic() - last_checked < self.health_check_interval:
+                return conn
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+    def release(self, conn):
+        """Reset a connection and return it to the pool"""
+        try:
+            # Same semantics as closing a plain connection: drop uncommitted work
+            if conn.in_transaction:
+                conn.rollback()
+            # Routes may switch foreign keys off temporarily
+            conn.execute("PRAGMA foreign_keys = ON")
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        with self._available:
+            self._idle.append((conn, time.monotonic()))
+            self._available.notify()
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._available:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._forget()
+
+    def _forget(self):
+        """Free the slot of a connection that was closed or never opened"""
+        with self._available:
+            self._open -= 1
+            self._available.notify()
+
+
+class PooledConnection:
+    """Request-scoped handle around a pooled connection.
+
+    Routes and helpers keep calling ``close()`` as they did with plain
+    connections, but since they all share this handle during a request,
+    ``close()`` does nothing: a helper closing "its" connection must not
+    roll back the caller's uncommitted writes. Uncommitted work is discarded
+    once, when the connection goes back to the pool at app context teardown.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        pass
+
+
+def _get_pool(database):
+    pools = current_app.extensions.setdefault('db_pools', {})
+    pool = pools.get(database)
+    if pool is None:
+        pool = pools.setdefault(database, ConnectionPool(
+            database,
+            max_size=current_app.config['DB_POOL_SIZE'],
+            health_check_interval=current_app.config['DB_HEALTH_CHECK_INTERVAL'],
+            timeout=current_app.config['DB_POOL_TIMEOUT'],
+        ))
+    return pool
+
+
+def get_db_connection(database=TRACKADEMIC_DB):
+    """Get database connection for trackademic database.
+
+    Inside an app context the same pooled connection is returned for every
+    call during a request. Outside one (scripts, startup) a plain connection
+    is opened and the caller is responsible for closing it.
+    """
+    try:
+        if not has_app_context():
+            return connect(database)
+
+        connections = g.setdefault('_db_connections', {})
+        if database not in connections:
+            connections[database] = PooledConnection(_get_pool(database).acquire())
+        return connections[database]
+    except sqlite3.Error as e:
+        print(f"Database connection error: {e}")
+        return None
+
+
+def get_social_db_connection():
+    """Get database connection for social platform database"""
+    return get_db_connection(SOCIAL_DB)
+
+
+def close_db_connections(exception=None):
+    """Return the connections used by this app context to their pools"""
+    connections = g.pop('_db_connections', {})
+    for database, handle in connections.items():
+        _get_pool(database).release(handle._conn)
+
+
+def init_app(app):
+    """Register pool configuration defaults and teardown on the app"""
+    app.config.setdefault('DB_POOL_SIZE', 5)
+    app.config.setdefault('DB_HEALTH_CHECK_INTERVAL', 30.0)
+    app.config.setdefault('DB_POOL_TIMEOUT', 10.0)
+    app.teardown_appcontext(close_db_connections)
@@ -0,0 +1,269 @@
+"""Cohort GPA statistics served from aggregate tables.
+
+Triggers on ``gpa`` keep three small tables up to date on every write:
+
+* ``gpa_trimester_stats`` - row count and GPA/credit sums per trimester
+* ``gpa_histogram`` - row count per trimester and 0.01-wide GPA bucket
+* ``gpa_credit_load`` - row count per trimester and credit total
+
+Means are exact; medians and percentiles are read off the histogram, so
+they are accurate to the 0.01 bucket width. Reading the statistics never
+touches the gpa rows themselves, however many there are.
+"""
+import sqlite3
+
+# GPA is stored to full float precision; buckets are hundredths (0..400)
+BUCKETS_PER_POINT = 100
+
+GPA_ANALYTICS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS gpa_trimester_stats (
+    trimester TEXT PRIMARY KEY,
+    records INTEGER NOT NULL DEFAULT 0,
+    gpa_sum REAL NOT NULL DEFAULT 0.0,
+    credits_sum INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS gpa_histogram (
+    trimester TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    records INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (trimester, bucket)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS gpa_credit_load (
+    trimester TEXT NOT NULL,
+    total_credits INTEGER NOT NULL,
+    records INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (trimester, total_credits)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS gpa_analytics_insert AFTER INSERT ON gpa BEGIN
+    INSERT INTO gpa_trimester_stats (trimester, records, gpa_sum, credits_sum)
+    VALUES (new.trimester, 1, new.gpa, COALESCE(new.total_credits, 0))
+    ON CONFLICT(trimester) DO UPDATE SET
+        records = records + 1,
+        gpa_sum = gpa_sum + excluded.gpa_sum,
+        credits_sum = credits_sum + excluded.credits_sum;
+    INSERT INTO gpa_histogram (trimester, bucket, records)
+    VALUES (new.trimester, CAST(ROUND(new.gpa * 100) AS INTEGER), 1)
+    ON CONFLICT(trimester, bucket) DO UPDATE SET records = records + 1;
+    INSERT INTO gpa_credit_load (trimester, total_credits, records)
+    VALUES (new.trimester, COALESCE(new.total_credits, 0), 1)
+    ON CONFLICT(trimester, total_credits) DO UPDATE SET records = records + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS gpa_analytics_delete AFTER DELETE ON gpa BEGIN
+    UPDATE gpa_trimester_stats SET
+        records = records - 1,
+        gpa_sum = gpa_sum - old.gpa,
+        credits_sum = credits_sum - COALESCE(old.total_credits, 0)
+    WHERE trimester = old.trimester;
+    UPDATE gpa_histogram SET records = records - 1
+    WHERE trimester = old.trimester AND bucket = CAST(ROUND(old.gpa * 100) AS INTEGER);
+    UPDATE gpa_credit_load SET records = records - 1
+    WHERE trimester = old.trimester AND total_credits = COALESCE(old.total_credits, 0);
+    DELETE FROM gpa_trimester_stats WHERE trimester = old.trimester AND records = 0;
+    DELETE FROM gpa_histogram WHERE trimester = old.trimester AND records = 0;
+    DELETE FROM gpa_credit_load WHERE trimester = old.trimester AND records = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS gpa_analytics_update
+AFTER UPDATE OF trimester, gpa, total_credits ON gpa BEGIN
+    UPDATE gpa_trimester_stats SET
+        records = records - 1,
+        gpa_sum = gpa_sum - old.gpa,
+        credits_sum = credits_sum - COALESCE(old.total_credits, 0)
+    WHERE trimester = old.trimester;
+    UPDATE gpa_histogram SET records = records - 1
+    WHERE trimester = old.trimester AND bucket = CAST(ROUND(old.gpa * 100) AS INTEGER);
+    UPDATE gpa_credit_load SET records = records - 1
+    WHERE trimester = old.trimester AND total_credits = COALESCE(old.total_credits, 0);
+    DELETE FROM gpa_trimester_stats WHERE trimester = old.trimester AND records = 0;
+    DELETE FROM gpa_histogram WHERE trimester = old.trimester AND records = 0;
+    DELETE FROM gpa_credit_load WHERE trimester = old.trimester AND records = 0;
+
+    INSERT INTO gpa_trimester_stats (trimester, records, gpa_sum, credits_sum)
+    VALUES (new.trimester, 1, new.gpa, COALESCE(new.total_credits, 0))
+    ON CONFLICT(trimester) DO UPDATE SET
+        records = records + 1,
+        gpa_sum = gpa_sum + excluded.gpa_sum,
+        credits_sum = credits_sum + excluded.credits_sum;
+    INSERT INTO gpa_histogram (trimester, bucket, records)
+    VALUES (new.trimester, CAST(ROUND(new.gpa * 100) AS INTEGER), 1)
+    ON CONFLICT(trimester, bucket) DO UPDATE SET records = records + 1;
+    INSERT INTO gpa_credit_load (trimester, total_credits, records)
+    VALUES (new.trimester, COALESCE(new.total_credits, 0), 1)
+    ON CONFLICT(trimester, total_credits) DO UPDATE SET records = records + 1;
+END;
+"""
+
+# Recompute the aggregates from the gpa rows; also run by the migration that adds them
+REBUILD_GPA_ANALYTICS = """
+DELETE FROM gpa_trimester_stats;
+DELETE FROM gpa_histogram;
+DELETE FROM gpa_credit_load;
+
+INSERT INTO gpa_trimester_stats (trimester, records, gpa_sum, credits_sum)
+SELECT trimester, COUNT(*), SUM(gpa), COALESCE(SUM(total_credits), 0) FROM gpa GROUP BY trimester;
+INSERT INTO gpa_histogram (trimester, bucket, records)
+SELECT trimester, CAST(ROUND(gpa * 100) AS INTEGER), COUNT(*) FROM gpa GROUP BY 1, 2;
+INSERT INTO gpa_credit_load (trimester, total_credits, records)
+SELECT trimester, COALESCE(total_credits, 0), COUNT(*) FROM gpa GROUP BY 1, 2;
+"""
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Allowed difference between the running and recomputed GPA sums
+TOLERANCE = 1e-6
+
+# Histogram widths check-gpa-analytics folds the buckets into; 0.3 and 0.7 do not divide 4.0
+CHECK_BIN_WIDTHS = (0.1, 0.25, 0.3, 0.5, 0.7, 1.0)
+
+# (table, key column count, stored rows, the same rows recomputed from gpa)
+ANALYTICS_CHECKS = (
+    ('gpa_trimester_stats', 1,
+     'SELECT trimester, records, gpa_sum, credits_sum FROM gpa_trimester_stats',
+     'SELECT trimester, COUNT(*), SUM(gpa), COALESCE(SUM(total_credits), 0) FROM gpa GROUP BY trimester'),
+    ('gpa_histogram', 2,
+     'SELECT trimester, bucket, records FROM gpa_histogram',
+     'SELECT trimester, CAST(ROUND(gpa * 100) AS INTEGER), COUNT(*) FROM gpa GROUP BY 1, 2'),
+    ('gpa_credit_load', 2,
+     'SELECT trimester, total_credits, records FROM gpa_credit_load',
+     'SELECT trimester, COALESCE(total_credits, 0), COUNT(*) FROM gpa GROUP BY 1, 2'),
+)
+
+
+def rebuild_gpa_analytics(conn):
+    """Recompute the aggregate tables from the gpa table in one transaction"""
+    try:
+        conn.executescript("BEGIN;" + REBUILD_GPA_ANALYTICS + "COMMIT;")
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+
+def _values_match(have, want):
+    if have is None or want is None:
+        return have == want
+    return all(abs(a - b) <= TOLERANCE if isinstance(a, float) or isinstance(b, float) else a == b
+               for a, b in zip(have, want))
+
+
+def find_gpa_analytics_mismatches(conn):
+    """Return (table, key, stored, expected) for aggregate rows that disagree with gpa"""
+    mismatches = []
+    for table, key_columns, stored_sql, expected_sql in ANALYTICS_CHECKS:
+        stored = {tuple(row[:key_columns]): tuple(row[key_columns:]) for row in conn.execute(stored_sql)}
+        expected = {tuple(row[:key_columns]): tuple(row[key_columns:]) for row in conn.execute(expected_sql)}
+        for key in sorted(stored.keys() | expected.keys(), key=repr):
+            have, want = stored.get(key), expected.get(key)
+            if not _values_match(have, want):
+                mismatches.append((table, key, have, want))
+    return mismatches
+
+
+def percentiles(histogram, total, wanted=PERCENTILES):
+    """Nearest-rank percentiles from (bucket, records) pairs sorted by bucket"""
+    if not total:
+        return {f'p{p}': None for p in wanted}
+    results = {}
+    targets = iter(sorted(wanted))
+    target = next(targets)
+    seen = 0
+    for bucket, records in histogram:
+        seen += records
+        while target is not None and seen * 100 >= target * total:
+            results[f'p{target}'] = bucket / BUCKETS_PER_POINT
+            target = next(targets, None)
+        if target is None:
+            break
+    return results
+
+
+def _summarize(records, gpa_sum, credits_sum, histogram, credit_load, bin_width):
+    # Fold the 0.01 buckets into bins of the requested width, keyed by lower edge;
+    # a 4.00 joins the top bin, which stops at 4.0 when the width does not divide it
+    bins = {}
+    top = 4 * BUCKETS_PER_POINT
+    width = max(1, round(bin_width * BUCKETS_PER_POINT))
+    for bucket, count in histogram:
+        lower = min(bucket, top - 1) // width * width
+        bins[lower] = bins.get(lower, 0) + count
+    summary = {
+        'records': records,
+        'mean_gpa': gpa_sum / records if records else None,
+        'mean_credits': credits_sum / records if records else None,
+        'histogram': [
+            {'from': lower / BUCKETS_PER_POINT, 'to': min(lower + width, top) / BUCKETS_PER_POINT, 'records': count}
+            for lower, count in sorted(bins.items())
+        ],
+        'credit_load': [{'total_credits': credits, 'records': count} for credits, count in credit_load],
+    }
+    summary.update(percentiles(histogram, records))
+    return summary
+
+
+def cohort_stats(conn, trimester=None, bin_width=0.5):
+    """GPA distribution for the whole cohort and for each trimester (or just one)"""
+    where, params = ('WHERE trimester = ?', (trimester,)) if trimester else ('', ())
+    trimesters = conn.execute(
+        f'SELECT trimester, records, gpa_sum, credits_sum FROM gpa_trimester_stats {where} ORDER BY trimester',
+        params
+    ).fetchall()
+
+    histograms, credit_loads = {}, {}
+    for name, bucket, records in conn.execute(
+            f'SELECT trimester, bucket, records FROM gpa_histogram {where} ORDER BY trimester, bucket', params):
+        histograms.setdefault(name, []).append((bucket, records))
+    for name, credits, records in conn.execute(
+            f'SELECT trimester, total_credits, records FROM gpa_credit_load {where} ORDER BY trimester, total_credits',
+            params):
+        credit_loads.setdefault(name, []).append((credits, records))
+
+    overall_histogram, overall_load = {}, {}
+    for rows, merged in ((histograms, overall_histogram), (credit_loads, overall_load)):
+        for pairs in rows.values():
+            for key, records in pairs:
+                merged[key] = merged.get(key, 0) + records
+
+    return {
+        'overall': _summarize(
+            sum(row['records'] for row in trimesters),
+            sum(row['gpa_sum'] for row in trimesters),
+            sum(row['credits_sum'] for row in trimesters),
+            sorted(overall_histogram.items()),
+            sorted(overall_load.items()),
+            bin_width,
+        ),
+        'trimesters': {
+            row['trimester']: _summarize(
+                row['records'], row['gpa_sum'], row['credits_sum'],
+                histograms.get(row['trimester'], []),
+                credit_loads.get(row['trimester'], []),
+                bin_width,
+            )
+            for row in trimesters
+        },
+    }
+
+
+def find_histogram_bin_problems(conn, widths=CHECK_BIN_WIDTHS):
+    """Return (bin_width, scope, problem) wherever cohort_stats() bins overlap, misalign or lose records"""
+    problems = []
+    for bin_width in widths:
+        stats = cohort_stats(conn, bin_width=bin_width)
+        scopes = [('overall', stats['overall'])] + sorted(stats['trimesters'].items())
+        width = max(1, round(bin_width * BUCKETS_PER_POINT))
+        for scope, summary in scopes:
+            previous_to = 0
+            for item in summary['histogram']:
+                lower, upper = round(item['from'] * BUCKETS_PER_POINT), round(item['to'] * BUCKETS_PER_POINT)
+                if lower < previous_to:
+                    problems.append((bin_width, scope, f"bin {item['from']}-{item['to']} overlaps the one before"))
+                if lower % width or not lower < upper <= 4 * BUCKETS_PER_POINT:
+                    problems.append((bin_width, scope, f"bin {item['from']}-{item['to']} is misaligned"))
+                previous_to = upper
+            binned = sum(item['records'] for item in summary['histogram'])
+            if binned != summary['records']:
+                problems.append((bin_width, scope, f"bins hold {binned} records, expected {summary['records']}"))
+    return problems
@@ -0,0 +1,113 @@
+"""Grade scale and batch GPA/CGPA computation.
+
+The batch functions take flat, parallel sequences (one entry per subject or
+per trimester) plus a group index saying which student or trimester each
+entry belongs to, and compute every group's totals in one pass. NumPy is
+used when it is installed; otherwise the same pass runs over array.array.
+NumPy is imported on the first batch call, not with this module, so pages
+that only need the grade scale do not pay for loading it.
+"""
+import array
+
+_np = None
+
+
+def load_numpy():
+    """The numpy module, or None if it is not installed (imported once, on first use)"""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _np = numpy
+    return _np or None
+
+
+GRADE_SCALE = {
+    'A+': 4.00,
+    'A': 4.00,
+    'A-': 3.67,
+    'B+': 3.33,
+    'B': 3.00,
+    'B-': 2.67,
+    'C+': 2.33,
+    'C': 2.00,
+    'C-': 1.67,
+    'D+': 1.33,
+    'D': 1.00,
+    'F': 0.00
+}
+
+# Grades are encoded as indexes into GRADE_POINTS; UNGRADED entries are skipped
+GRADE_CODES = tuple(GRADE_SCALE)
+GRADE_POINTS = tuple(GRADE_SCALE.values())
+UNGRADED = -1
+_GRADE_INDEX = {code: index for index, code in enumerate(GRADE_CODES)}
+
+
+def encode_grades(grades):
+    """Turn grade codes ('A-', '', None, ...) into a compact array of grade indexes"""
+    return array.array('b', (_GRADE_INDEX.get(grade, UNGRADED) for grade in grades))
+
+
+def batch_gpa(groups, grades, credits, n_groups, vectorized=None):
+    """Per-group GPA over subjects.
+
+    groups[i] is the group (student-trimester) of subject i, grades[i] its
+    encoded grade and credits[i] its credit hours. Ungraded subjects count
+    towards neither credits nor grade points, as on the calculator page.
+    Returns (total_credits, total_grade_points, gpa), each n_groups long.
+    """
+    np = load_numpy()
+    if vectorized is None:
+        vectorized = np is not None
+    if vectorized:
+        grades = np.asarray(grades, dtype=np.int8)
+        graded = grades != UNGRADED
+        graded_credits = np.asarray(credits, dtype=np.float64) * graded
+        points = np.asarray(GRADE_POINTS)[np.where(graded, grades, 0)] * graded_credits
+        return _grouped_ratio_numpy(groups, graded_credits, points, n_groups)
+
+    total_credits = array.array('d', bytes(8 * n_groups))
+    total_points = array.array('d', bytes(8 * n_groups))
+    for group, grade, credit in zip(groups, grades, credits):
+        if grade != UNGRADED:
+            total_credits[group] += credit
+            total_points[group] += GRADE_POINTS[grade] * credit
+    return total_credits, total_points, _ratio(total_points, total_credits)
+
+
+def batch_cgpa(groups, credits, grade_points, n_groups, vectorized=None):
+    """Per-group CGPA over trimesters.
+
+    groups[i] is the student of trimester i, with that trimester's total
+    credits and total grade points. Returns (total_credits,
+    total_grade_points, cgpa), each n_groups long.
+    """
+    np = load_numpy()
+    if vectorized is None:
+        vectorized = np is not None
+    if vectorized:
+        return _grouped_ratio_numpy(groups, credits, grade_points, n_groups)
+
+    total_credits = array.array('d', bytes(8 * n_groups))
+    total_points = array.array('d', bytes(8 * n_groups))
+    for group, credit, points in zip(groups, credits, grade_points):
+        total_credits[group] += credit
+        total_points[group] += points
+    return total_credits, total_points, _ratio(total_points, total_credits)
+
+
+def _grouped_ratio_numpy(groups, credits, points, n_groups):
+    np = load_numpy()
+    groups = np.asarray(groups, dtype=np.intp)
+    total_credits = np.bincount(groups, weights=credits, minlength=n_groups)
+    total_points = np.bincount(groups, weights=points, minlength=n_groups)
+    ratio = np.divide(total_points, total_credits,
+                      out=np.zeros(n_groups), where=total_credits > 0)
+    return total_credits, total_points, ratio
+
+
+def _ratio(points, credits):
+    return array.array('d', (p / c if c > 0 else 0.0 for p, c in zip(points, credits)))
@@ -0,0 +1,138 @@
+"""Per-user running CGPA totals, kept in step with the gpa table by triggers.
+
+Every insert, update or delete on ``gpa`` adjusts the user's row in
+``gpa_totals`` inside the same statement, so CGPA is a primary key read
+and the totals can never be committed out of step with the GPA rows.
+``version`` goes up on every change (and never back down), which makes
+it usable as a cache validator for the user's GPA history.
+"""
+import sqlite3
+from collections import Counter
+
+
+GPA_TOTALS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS gpa_totals (
+    user_id INTEGER PRIMARY KEY,
+    trimesters INTEGER NOT NULL DEFAULT 0,
+    total_credits INTEGER NOT NULL DEFAULT 0,
+    total_grade_points REAL NOT NULL DEFAULT 0.0,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS gpa_totals_insert AFTER INSERT ON gpa BEGIN
+    INSERT INTO gpa_totals (user_id, trimesters, total_credits, total_grade_points, version)
+    VALUES (new.user_id, 1, COALESCE(new.total_credits, 0), COALESCE(new.total_grade_points, 0), 1)
+    ON CONFLICT(user_id) DO UPDATE SET
+        trimesters = trimesters + 1,
+        total_credits = total_credits + excluded.total_credits,
+        total_grade_points = total_grade_points + excluded.total_grade_points,
+        version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS gpa_totals_update AFTER UPDATE ON gpa BEGIN
+    UPDATE gpa_totals SET
+        total_credits = total_credits - COALESCE(old.total_credits, 0),
+        total_grade_points = total_grade_points - COALESCE(old.total_grade_points, 0),
+        trimesters = trimesters - 1,
+        version = version + 1
+    WHERE user_id = old.user_id;
+    INSERT INTO gpa_totals (user_id, trimesters, total_credits, total_grade_points, version)
+    VALUES (new.user_id, 1, COALESCE(new.total_credits, 0), COALESCE(new.total_grade_points, 0), 1)
+    ON CONFLICT(user_id) DO UPDATE SET
+        trimesters = trimesters + 1,
+        total_credits = total_credits + excluded.total_credits,
+        total_grade_points = total_grade_points + excluded.total_grade_points,
+        version = version + 1;
+END;
+
+-- Going back to zero trimesters resets the sums exactly, so float drift cannot pile up
+CREATE TRIGGER IF NOT EXISTS gpa_totals_delete AFTER DELETE ON gpa BEGIN
+    UPDATE gpa_totals SET
+        total_credits = CASE WHEN trimesters = 1 THEN 0
+                             ELSE total_credits - COALESCE(old.total_credits, 0) END,
+        total_grade_points = CASE WHEN trimesters = 1 THEN 0.0
+                                  ELSE total_grade_points - COALESCE(old.total_grade_points, 0) END,
+        trimesters = trimesters - 1,
+        version = version + 1
+    WHERE user_id = old.user_id;
+END;
+"""
+
+# Recompute every user's totals from the gpa rows; also run by the migration that adds the table
+REBUILD_GPA_TOTALS = """
+INSERT INTO gpa_totals (user_id, trimesters, total_credits, total_grade_points, version)
+SELECT user_id, COUNT(*), COALESCE(SUM(total_credits), 0), COALESCE(SUM(total_grade_points), 0), 1
+FROM gpa WHERE true GROUP BY user_id
+ON CONFLICT(user_id) DO UPDATE SET
+    trimesters = excluded.trimesters,
+    total_credits = excluded.total_credits,
+    total_grade_points = excluded.total_grade_points,
+    version = version + 1;
+
+UPDATE gpa_totals SET trimesters = 0, total_credits = 0, total_grade_points = 0.0, version = version + 1
+WHERE user_id NOT IN (SELECT user_id FROM gpa);
+"""
+
+# Allowed difference between the running and recomputed grade point sums
+TOLERANCE = 1e-6
+
+
+def get_cgpa(conn, user_id):
+    """CGPA from the running totals: one primary key lookup"""
+    totals = conn.execute(
+        'SELECT total_credits, total_grade_points FROM gpa_totals WHERE user_id = ?',
+        (user_id,)
+    ).fetchone()
+    if not totals or totals['total_credits'] <= 0:
+        return 0.0
+    return totals['total_grade_points'] / totals['total_credits']
+
+
+def get_gpa_version(conn, user_id):
+    """Change counter for a user's GPA rows (0 if they never had any)"""
+    row = conn.execute('SELECT version FROM gpa_totals WHERE user_id = ?', (user_id,)).fetchone()
+    return row['version'] if row else 0
+
+
+def find_gpa_total_mismatches(conn):
+    """Return (user_id, stored, expected) for users whose running totals disagree with gpa.
+
+    The expected totals are recomputed from the raw rows with batch_cgpa(),
+    outside SQLite, so the check does not share its arithmetic with the triggers.
+    """
+    from gpa_engine import batch_cgpa
+
+    rows = conn.execute(
+        'SELECT user_id, COALESCE(total_credits, 0), COALESCE(total_grade_points, 0) FROM gpa'
+    ).fetchall()
+    user_ids = sorted({row[0] for row in rows})
+    group_of = {user_id: group for group, user_id in enumerate(user_ids)}
+    groups = [group_of[row[0]] for row in rows]
+    credits, points, _ = batch_cgpa(groups, [row[1] for row in rows], [row[2] for row in rows], len(user_ids))
+    trimesters = Counter(groups)
+    expected = {
+        user_id: (trimesters[group], int(round(credits[group])), float(points[group]))
+        for group, user_id in enumerate(user_ids)
+    }
+    stored = {
+        row[0]: tuple(row[1:]) for row in conn.execute(
+            'SELECT user_id, trimesters, total_credits, total_grade_points FROM gpa_totals'
+        )
+    }
+
+    mismatches = []
+    for user_id in sorted(expected.keys() | stored.keys()):
+        want = expected.get(user_id, (0, 0, 0.0))
+        have = stored.get(user_id, (0, 0, 0.0))
+        if have[:2] != want[:2] or abs(have[2] - want[2]) > TOLERANCE:
+            mismatches.append((user_id, have, want))
+    return mismatches
+
+
+def rebuild_gpa_totals(conn):
+    """Recompute gpa_totals from the gpa table in one transaction"""
+    try:
+        conn.executescript("BEGIN;" + REBUILD_GPA_TOTALS + "COMMIT;")
+    except sqlite3.Error:
+        conn.rollback()
+        raise
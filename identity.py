@@ -0,0 +1,135 @@
+"""Mapping from social platform users to their Trackademic accounts.
+
+The two apps keep separate user tables. The mapping is stored in the
+``identity_map`` table and cached in-process, so GPA requests no longer
+look the user up across both databases on every call.
+
+``session['user_id']`` is a social id only for logins through the social
+database; login records which one in ``session['login_source']``, and
+current_trackademic_user_id() only consults the map for social logins.
+"""
+import sqlite3
+
+from flask import session
+
+from cache import LRUCache
+from db import get_social_db_connection
+
+# Entries expire so a user deleted through another worker is picked up eventually
+IDENTITY_CACHE = LRUCache(maxsize=4096, ttl=300)
+
+
+def remember_identity(conn, social_user_id, trackademic_user_id):
+    """Record which Trackademic account a social user belongs to"""
+    conn.execute('''
+        INSERT INTO identity_map (social_user_id, trackademic_user_id) VALUES (?, ?)
+        ON CONFLICT(social_user_id) DO UPDATE SET trackademic_user_id = excluded.trackademic_user_id
+    ''', (social_user_id, trackademic_user_id))
+    conn.commit()
+    IDENTITY_CACHE.set(social_user_id, trackademic_user_id)
+
+
+def resolve_trackademic_user_id(conn, social_user_id, create=False):
+    """Return the Trackademic user id for a social user id, or None.
+
+    Accounts that predate the identity map are matched by email, then by
+    username, and the result is recorded. With create=True a Trackademic
+    account is created when no match exists.
+    """
+    trackademic_user_id = IDENTITY_CACHE.get(social_user_id)
+    if trackademic_user_id is not None:
+        return trackademic_user_id
+
+    mapped = conn.execute(
+        'SELECT trackademic_user_id FROM identity_map WHERE social_user_id = ?',
+        (social_user_id,)
+    ).fetchone()
+    if mapped:
+        IDENTITY_CACHE.set(social_user_id, mapped['trackademic_user_id'])
+        return mapped['trackademic_user_id']
+
+    social_db = get_social_db_connection()
+    social_user = social_db.execute(
+        'SELECT username, email FROM users WHERE id = ?',
+        (social_user_id,)
+    ).fetchone()
+    social_db.close()
+    if not social_user:
+        return None
+
+    track_user = conn.execute(
+        'SELECT user_id FROM trackademic_users WHERE email = ?',
+        (social_user['email'],)
+    ).fetchone()
+    if not track_user:
+        track_user = conn.execute(
+            'SELECT user_id FROM trackademic_users WHERE username = ?',
+            (social_user['username'],)
+        ).fetchone()
+
+    if track_user:
+        trackademic_user_id = track_user['user_id']
+    elif create:
+        try:
+            cursor = conn.execute(
+                'INSERT INTO trackademic_users (username, email, password, is_admin) VALUES (?, ?, ?, ?)',
+                (social_user['username'], social_user['email'], 'default_password', 0)
+            )
+            conn.commit()
+            trackademic_user_id = cursor.lastrowid
+            print(f"Created new trackademic user: {trackademic_user_id}")
+        except sqlite3.IntegrityError:
+            # User might have been created by another process
+            conn.rollback()
+            track_user = conn.execute(
+                'SELECT user_id FROM trackademic_users WHERE email = ?',
+                (social_user['email'],)
+            ).fetchone()
+            if not track_user:
+                return None
+            trackademic_user_id = track_user['user_id']
+    else:
+        return None
+
+    remember_identity(conn, social_user_id, trackademic_user_id)
+    return trackademic_user_id
+
+
+def current_trackademic_user_id(conn, create=False):
+    """Trackademic user id of the logged-in user, or None.
+
+    Social logins go through the identity map. Trackademic logins, and
+    sessions from before the login source was recorded, are matched by the
+    session's email, then username; with create=True an account is created
+    from the session when neither matches.
+    """
+    if session.get('login_source') == 'social':
+        return resolve_trackademic_user_id(conn, session['user_id'], create=create)
+
+    for column, value in (('email', session.get('email')), ('username', session.get('username'))):
+        if value:
+            track_user = conn.execute(
+                f'SELECT user_id FROM trackademic_users WHERE {column} = ?', (value,)
+            ).fetchone()
+            if track_user:
+                return track_user['user_id']
+    if not create or not session.get('username'):
+        return None
+
+    cursor = conn.execute(
+        'INSERT INTO trackademic_users (username, email, password, is_admin) VALUES (?, ?, ?, ?)',
+        (session['username'], session.get('email') or f"{session['username']}@example.com", 'default_password', 0)
+    )
+    conn.commit()
+    return cursor.lastrowid
+
+
+def forget_trackademic_user(trackademic_user_id=None):
+    """Drop cached mappings to a deleted Trackademic user, or all of them.
+
+    The identity_map rows themselves go away through ON DELETE CASCADE.
+    """
+    if trackademic_user_id is None:
+        IDENTITY_CACHE.clear()
+    else:
+        IDENTITY_CACHE.remove_where(lambda key, value: value == trackademic_user_id)
@@ -0,0 +1,415 @@
+"""Versioned schema migrations for the Trackademic and social databases.
+
+Each database records the last migration applied in ``PRAGMA user_version``.
+A migration is ``(version, description, step)`` where step is either a SQL
+script or a callable taking the connection. Every migration runs in its own
+transaction together with the version bump, so a failed step leaves the
+database at the previous version. Callables must not commit.
+"""
+import sqlite3
+
+from catalog import CATALOG_VERSION_TRIGGERS
+from db import SOCIAL_DB, TRACKADEMIC_DB, connect
+from gpa_analytics import GPA_ANALYTICS_SCHEMA, REBUILD_GPA_ANALYTICS
+from gpa_totals import GPA_TOTALS_SCHEMA, REBUILD_GPA_TOTALS
+from notes_store import NOTE_CHUNKS_SCHEMA, notes_query, write_note_file
+from search import REBUILD_SEARCH_INDEX, SEARCH_SCHEMA
+from social_feed import COMMENTS_FOR_POSTS, feed_query, saved_posts_query
+from tasks import (OVERLAPPING_SLOT, SLOT_MINUTES, WEEK_QUERY, WEEK_VERSION, WEEK_VERSION_SCHEMA, minutes_to_time,
+                   parse_time_slot)
+
+
+def _add_timetable_minutes(conn):
+    """Store each slot's start and end as minutes after midnight, parsed from time_slot"""
+    conn.execute("ALTER TABLE timetable ADD COLUMN start_minutes INTEGER")
+    conn.execute("ALTER TABLE timetable ADD COLUMN end_minutes INTEGER")
+    rows = conn.execute("SELECT timetable_id, time_slot FROM timetable").fetchall()
+    conn.executemany(
+        "UPDATE timetable SET start_minutes = ?, end_minutes = ? WHERE timetable_id = ?",
+        [(*parse_time_slot(time_slot), timetable_id) for timetable_id, time_slot in rows]
+    )
+    # Overlap checks range-scan start_minutes and read end_minutes from the index
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_timetable_user_day_start "
+        "ON timetable(user_id, day, start_minutes, end_minutes)"
+    )
+
+
+def _snap_timetable_slots(conn):
+    """Move slots that start off a half-hour boundary onto one, keeping their length.
+
+    Completion bits are per half hour, so such a slot shared its bit with
+    whatever else started in that half hour. Each one moves back to the
+    boundary it was already counted under, or on to the next free boundary
+    that day if another slot starts there; one that runs out of day is deleted.
+    """
+    rows = conn.execute(
+        "SELECT timetable_id, user_id, day, time_slot, start_minutes, end_minutes FROM timetable "
+        "WHERE start_minutes IS NOT NULL ORDER BY user_id, day, start_minutes, timetable_id"
+    ).fetchall()
+    taken = {(row[1], row[2], row[4] // SLOT_MINUTES) for row in rows if row[4] % SLOT_MINUTES == 0}
+    for timetable_id, user_id, day, time_slot, start, end in rows:
+        if start % SLOT_MINUTES == 0:
+            continue
+        bit = start // SLOT_MINUTES
+        while (user_id, day, bit) in taken:
+            bit += 1
+        new_start = bit * SLOT_MINUTES
+        if new_start >= 24 * 60:
+            print(f"Deleting timetable slot {timetable_id} ({time_slot}): no free half hour left that day")
+            conn.execute("DELETE FROM timetable WHERE timetable_id = ?", (timetable_id,))
+            continue
+        taken.add((user_id, day, bit))
+        new_end = min(end + new_start - start, 24 * 60 - 1) if end is not None else None
+        end_text = minutes_to_time(new_end) if new_end is not None else time_slot.partition(' - ')[2]
+        conn.execute(
+            "UPDATE timetable SET time_slot = ?, start_minutes = ?, end_minutes = ? WHERE timetable_id = ?",
+            (f"{minutes_to_time(new_start)} - {end_text}", new_start, new_end, timetable_id)
+        )
+
+
+def _move_note_files(conn):
+    """Copy every notes.file into note_chunks, a chunk at a time, then drop the column"""
+    for statement in _statements(NOTE_CHUNKS_SCHEMA):
+        conn.execute(statement)
+    conn.execute("ALTER TABLE notes ADD COLUMN size INTEGER")
+    note_ids = [row[0] for row in conn.execute("SELECT note_id FROM notes WHERE file IS NOT NULL")]
+    for note_id in note_ids:
+        with conn.blobopen('notes', 'file', note_id, readonly=True) as blob:
+            write_note_file(conn, note_id, blob)
+    conn.execute("ALTER TABLE notes DROP COLUMN file")
+
+
+TRACKADEMIC_MIGRATIONS = [
+    (1, 'initial schema', """
+        CREATE TABLE IF NOT EXISTS subjects (
+            subject_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            subject_name TEXT NOT NULL UNIQUE,
+            subject_code TEXT UNIQUE,
+            credit_hours INTEGER DEFAULT 3,
+            task_description TEXT DEFAULT ''
+        );
+
+        CREATE TABLE IF NOT EXISTS timetable (
+            timetable_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            subject_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            time_slot TEXT NOT NULL,
+            task_description TEXT DEFAULT '',
+            FOREIGN KEY (subject_id) REFERENCES subjects(subject_id),
+            FOREIGN KEY (user_id) REFERENCES trackademic_users(user_id),
+            UNIQUE(user_id, day, time_slot)
+        );
+
+        CREATE TABLE IF NOT EXISTS trackademic_users (
+            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            email TEXT NOT NULL UNIQUE,
+            password TEXT NOT NULL,
+            is_admin INTEGER DEFAULT 0
+        );
+
+        CREATE TABLE IF NOT EXISTS gpa (
+            gpa_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            trimester TEXT NOT NULL,
+            gpa REAL NOT NULL CHECK (gpa >= 0.0 AND gpa <= 4.0),
+            total_credits INTEGER DEFAULT 0,
+            total_grade_points REAL DEFAULT 0.0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES trackademic_users(user_id) ON DELETE CASCADE,
+            UNIQUE(user_id, trimester)
+        );
+
+        CREATE TABLE IF NOT EXISTS notes (
+            note_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            subject_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            file_name TEXT NOT NULL,
+            file BLOB,
+            FOREIGN KEY (subject_id) REFERENCES subjects(subject_id)
+        );
+    """),
+    # timetable(user_id, day) and gpa(user_id) are already served by the
+    # UNIQUE(user_id, day, time_slot) and UNIQUE(user_id, trimester) indexes
+    (2, 'indexes for hot lookups', """
+        CREATE INDEX IF NOT EXISTS idx_timetable_subject_id ON timetable(subject_id);
+        CREATE INDEX IF NOT EXISTS idx_notes_subject_id ON notes(subject_id);
+    """),
+    (3, 'social to trackademic identity map', """
+        CREATE TABLE IF NOT EXISTS identity_map (
+            social_user_id INTEGER PRIMARY KEY,
+            trackademic_user_id INTEGER NOT NULL,
+            FOREIGN KEY (trackademic_user_id) REFERENCES trackademic_users(user_id) ON DELETE CASCADE
+        );
+        CREATE INDEX IF NOT EXISTS idx_identity_map_trackademic_user ON identity_map(trackademic_user_id);
+    """),
+    (4, 'server-side sessions', """
+        CREATE TABLE IF NOT EXISTS sessions (
+            sid TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at);
+    """),
+    (5, 'weekly task completion bitmaps', """
+        CREATE TABLE IF NOT EXISTS task_completions (
+            user_id INTEGER NOT NULL,
+            week_start TEXT NOT NULL,
+            day INTEGER NOT NULL,
+            slots INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, week_start, day)
+        ) WITHOUT ROWID;
+    """),
+    (6, 'timetable start and end minutes', _add_timetable_minutes),
+    (7, 'subjects catalog version', """
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+        INSERT OR IGNORE INTO catalog_version (name, version) VALUES ('subjects', 0);
+
+        CREATE TRIGGER IF NOT EXISTS subjects_version_insert AFTER INSERT ON subjects BEGIN
+            UPDATE catalog_version SET version = version + 1 WHERE name = 'subjects';
+        END;
+        CREATE TRIGGER IF NOT EXISTS subjects_version_update AFTER UPDATE ON subjects BEGIN
+            UPDATE catalog_version SET version = version + 1 WHERE name = 'subjects';
+        END;
+        CREATE TRIGGER IF NOT EXISTS subjects_version_delete AFTER DELETE ON subjects BEGIN
+            UPDATE catalog_version SET version = version + 1 WHERE name = 'subjects';
+        END;
+    """),
+    (8, 'running CGPA totals', GPA_TOTALS_SCHEMA + REBUILD_GPA_TOTALS),
+    (9, 'cohort GPA aggregates', GPA_ANALYTICS_SCHEMA + REBUILD_GPA_ANALYTICS),
+    (10, 'note files in chunks', _move_note_files),
+    # Single-column indexes end in the rowid (note_id), so each also walks its notes newest
+    # first; a (subject_id, user_id) index would duplicate idx_notes_subject_id and sort instead
+    (11, 'notes listing indexes', """
+        CREATE INDEX IF NOT EXISTS idx_notes_user_id ON notes(user_id);
+    """),
+    (12, 'timetable versions', WEEK_VERSION_SCHEMA),
+    (13, 'timetable slots on half-hour boundaries', _snap_timetable_slots),
+    (14, 'custom tasks outside the subjects catalog version', CATALOG_VERSION_TRIGGERS),
+]
+
+SOCIAL_MIGRATIONS = [
+    (1, 'initial schema', """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT,
+            email TEXT UNIQUE,
+            password TEXT,
+            is_admin INTEGER DEFAULT 0
+        );
+
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            content TEXT,
+            filename TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        );
+
+        CREATE TABLE IF NOT EXISTS comments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            post_id INTEGER,
+            user_id INTEGER,
+            username TEXT,
+            comment TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(post_id) REFERENCES posts(id)
+        );
+
+        CREATE TABLE IF NOT EXISTS folders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            folder_name TEXT,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        );
+
+        CREATE TABLE IF NOT EXISTS saved_posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            post_id INTEGER,
+            folder_id INTEGER,
+            FOREIGN KEY(user_id) REFERENCES users(id),
+            FOREIGN KEY(post_id) REFERENCES posts(id),
+            FOREIGN KEY(folder_id) REFERENCES folders(id)
+        );
+    """),
+    # saved_posts(post_id) backs the foreign key check and cleanup when a post is deleted
+    (2, 'indexes for hot lookups', """
+        CREATE INDEX IF NOT EXISTS idx_comments_post_id ON comments(post_id);
+        CREATE INDEX IF NOT EXISTS idx_saved_posts_user_post ON saved_posts(user_id, post_id);
+        CREATE INDEX IF NOT EXISTS idx_saved_posts_post_id ON saved_posts(post_id);
+        CREATE INDEX IF NOT EXISTS idx_saved_posts_folder_id ON saved_posts(folder_id);
+        CREATE INDEX IF NOT EXISTS idx_posts_user_id ON posts(user_id);
+        CREATE INDEX IF NOT EXISTS idx_folders_user_id ON folders(user_id);
+    """),
+    (3, 'full-text search index', SEARCH_SCHEMA + REBUILD_SEARCH_INDEX),
+    # Files saved before the blob store keep their names and get one reference per post using them
+    (4, 'content-addressed uploads', """
+        CREATE TABLE IF NOT EXISTS blobs (
+            name TEXT PRIMARY KEY,
+            size INTEGER,
+            refcount INTEGER NOT NULL DEFAULT 0
+        );
+        ALTER TABLE posts ADD COLUMN original_filename TEXT;
+        UPDATE posts SET original_filename = filename WHERE filename IS NOT NULL;
+        INSERT INTO blobs (name, refcount)
+        SELECT filename, COUNT(*) FROM posts WHERE filename IS NOT NULL AND filename != '' GROUP BY filename;
+    """),
+    # Saved-post pages walk a user's saves by id; the index ends in the rowid (sp.id), so no sort
+    (5, 'saved posts by user', """
+        CREATE INDEX IF NOT EXISTS idx_saved_posts_user_id ON saved_posts(user_id);
+    """),
+]
+
+MIGRATIONS = {
+    TRACKADEMIC_DB: TRACKADEMIC_MIGRATIONS,
+    SOCIAL_DB: SOCIAL_MIGRATIONS,
+}
+
+# Queries on request hot paths, checked with EXPLAIN QUERY PLAN by check_query_plans(); where
+# the app builds its SQL, the entry uses the same constant or builder so the check sees the real query
+HOT_QUERIES = {
+    TRACKADEMIC_DB: [
+        ('week for user', WEEK_QUERY, ('2024-01-01', 1)),
+        ('overlapping slot', OVERLAPPING_SLOT, (1, 0, 600, 540)),
+        ('gpa history for user', "SELECT * FROM gpa WHERE user_id = ? ORDER BY trimester", (1,)),
+        ('user by email', "SELECT user_id FROM trackademic_users WHERE email = ?", ('a@b.c',)),
+        ('user by username', "SELECT user_id FROM trackademic_users WHERE username = ?", ('a',)),
+        ('identity map', "SELECT trackademic_user_id FROM identity_map WHERE social_user_id = ?", (1,)),
+        ('cgpa totals', "SELECT total_credits, total_grade_points FROM gpa_totals WHERE user_id = ?", (1,)),
+        ('cohort trimester stats', "SELECT * FROM gpa_trimester_stats WHERE trimester = ?", ('T1',)),
+        ('cohort gpa histogram', """
+            SELECT trimester, bucket, records FROM gpa_histogram WHERE trimester = ? ORDER BY trimester, bucket
+        """, ('T1',)),
+        ('cohort credit load', """
+            SELECT trimester, total_credits, records FROM gpa_credit_load
+            WHERE trimester = ? ORDER BY trimester, total_credits
+        """, ('T1',)),
+        ('notes for subject', notes_query(by_subject=True, paged=True), (1, 100, 51)),
+        ('notes for user', notes_query(by_user=True), (1, 51)),
+        ('notes for subject and user', notes_query(by_subject=True, by_user=True), (1, 1, 51)),
+        ('note by id', "SELECT file_name, size FROM notes WHERE note_id = ?", (1,)),
+        ('note file chunks', "SELECT chunk_id FROM note_chunks WHERE note_id = ? ORDER BY seq", (1,)),
+        ('catalog version', "SELECT version FROM catalog_version WHERE name = 'subjects'", ()),
+        ('week version', WEEK_VERSION, (1,)),
+        ('session by id', "SELECT data, expires_at FROM sessions WHERE sid = ? AND expires_at > ?", ('x', 0)),
+        ('expired sessions', "DELETE FROM sessions WHERE expires_at <= ?", (0,)),
+    ],
+    SOCIAL_DB: [
+        ('blob release', "DELETE FROM blobs WHERE name = ? AND refcount <= 0", ('x',)),
+        ('blob by name', "SELECT 1 FROM blobs WHERE name = ?", ('x',)),
+        ('feed page', feed_query(paged=True), (1, 100, 21)),
+        ('feed search page', feed_query(search=True, paged=True), (1, '"x"*', '"x"*', 100, 21)),
+        ('comments for posts', COMMENTS_FOR_POSTS, ('[1, 2]',)),
+        ('saved posts page', saved_posts_query(paged=True), (1, 100, 21)),
+        ('saved posts search page', saved_posts_query(search=True, paged=True), (1, '"x"*', '"x"*', 100, 21)),
+        ('folders for user', """
+            SELECT DISTINCT folders.id, folders.folder_name
+            FROM folders JOIN saved_posts ON folders.id = saved_posts.folder_id
+            WHERE folders.user_id = ?
+        """, (1,)),
+        ('posts in folder', "SELECT COUNT(*) FROM saved_posts WHERE folder_id = ?", (1,)),
+        ('saves of post', "DELETE FROM saved_posts WHERE post_id = ?", (1,)),
+        ('comments of post', "DELETE FROM comments WHERE post_id = ?", (1,)),
+        ('search posts', """
+            SELECT posts.id FROM posts
+            WHERE posts.id IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?)
+        """, ('"x"*',)),
+    ],
+}
+
+# Hot queries allowed to sort: a feed search sorts only its full-text matches, which
+# arrive in rank order, rather than walking every post newest first to find them
+SORTED_MATCHES = {'feed search page'}
+
+
+def schema_version(conn):
+    """Return the migration version a database is at"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def latest_version(database):
+    """Return the newest migration version defined for a database"""
+    return MIGRATIONS[database][-1][0]
+
+
+def _statements(script):
+    """Split a SQL script into complete statements (trigger bodies stay intact)"""
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ''
+    if statement.strip():
+        yield statement
+
+
+def migrate(conn, migrations):
+    """Apply every migration newer than the database's current version.
+
+    Returns the list of (version, description) pairs that were applied.
+    Safe to run from several processes at once: each migration takes the
+    write lock first and re-checks the version before doing anything.
+    """
+    applied = []
+    for version, description, step in migrations:
+        if version <= schema_version(conn):
+            continue
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if version <= schema_version(conn):
+                conn.rollback()
+                continue
+            if callable(step):
+                step(conn)
+            else:
+                for statement in _statements(step):
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        applied.append((version, description))
+    return applied
+
+
+def schema_is_current(database):
+    """Cheap startup check: is the database already at the latest migration?"""
+    # Only reads user_version, so the storage PRAGMAs are not worth setting
+    conn = connect(database, pragmas=())
+    try:
+        return schema_version(conn) >= latest_version(database)
+    finally:
+        conn.close()
+
+
+def migrate_database(database):
+    """Open a database, bring it up to the latest schema and close it again"""
+    conn = connect(database)
+    try:
+        return migrate(conn, MIGRATIONS[database])
+    finally:
+        conn.close()
+
+
+def check_query_plans(conn, queries):
+    """Return (name, plan step) pairs for hot queries that scan a whole table or sort their rows"""
+    problems = []
+    for name, sql, params in queries:
+        for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params):
+            detail = row[3]
+            # Scanning a virtual table (FTS5, json_each) goes through its own index
+            if detail.startswith('SCAN ') and 'VIRTUAL TABLE' not in detail:
+                problems.append((name, detail))
+            # Paged queries must read rows in index order, not sort everything that matched
+            elif 'TEMP B-TREE' in detail and name not in SORTED_MATCHES:
+                problems.append((name, detail))
+    return problems
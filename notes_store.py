@@ -0,0 +1,95 @@
+"""Note file contents, stored apart from the notes rows.
+
+A note's file lives in ``note_chunks`` as a run of fixed-size chunks keyed
+by (note_id, seq); ``notes`` keeps only the name and the total size, so
+listing notes never reads file data. Chunks are read back with SQLite's
+incremental blob I/O (``Connection.blobopen``) a piece at a time, and
+written one chunk at a time, so neither direction holds a whole file in
+memory.
+"""
+CHUNK_SIZE = 64 * 1024
+
+DEFAULT_PAGE_SIZE = 50
+
+# Bytes handed out per read when streaming a chunk back
+READ_SIZE = 16 * 1024
+
+NOTE_CHUNKS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS note_chunks (
+    chunk_id INTEGER PRIMARY KEY,
+    note_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    UNIQUE (note_id, seq),
+    FOREIGN KEY (note_id) REFERENCES notes(note_id) ON DELETE CASCADE
+);
+"""
+
+# Metadata only: listings never name a chunk column
+NOTE_COLUMNS = 'note_id, subject_id, user_id, file_name, size'
+
+
+def notes_query(by_subject=False, by_user=False, paged=False):
+    """SQL for one page of notes, as run by list_notes(); params in the same order"""
+    conditions = []
+    if by_subject:
+        conditions.append('subject_id = ?')
+    if by_user:
+        conditions.append('user_id = ?')
+    if paged:
+        conditions.append('note_id < ?')
+    where = ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+    return f'SELECT {NOTE_COLUMNS} FROM notes{where} ORDER BY note_id DESC LIMIT ?'
+
+
+def list_notes(conn, subject_id=None, user_id=None, before=None, limit=DEFAULT_PAGE_SIZE):
+    """One page of notes for a subject, a user or both, newest first.
+
+    Keyed on ``note_id DESC`` like the social feed: pass the returned cursor
+    back as ``before`` for the next page. Returns ``(notes, next_cursor)``,
+    next_cursor being None on the last page. Served by idx_notes_subject_id
+    or idx_notes_user_id, both already in note_id order.
+    """
+    params = [value for value in (subject_id, user_id, before) if value is not None]
+    query = notes_query(subject_id is not None, user_id is not None, before is not None)
+    # One extra row tells us whether another page exists
+    rows = conn.execute(query, (*params, limit + 1)).fetchall()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1]['note_id']
+    return rows, None
+
+
+def write_note_file(conn, note_id, stream):
+    """Replace a note's file with the contents of a binary stream; returns its size.
+
+    Runs in conn's open transaction; the caller commits.
+    """
+    conn.execute('DELETE FROM note_chunks WHERE note_id = ?', (note_id,))
+    size = 0
+    seq = 0
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+        conn.execute(
+            'INSERT INTO note_chunks (note_id, seq, data) VALUES (?, ?, ?)',
+            (note_id, seq, chunk)
+        )
+        size += len(chunk)
+        seq += 1
+    conn.execute('UPDATE notes SET size = ? WHERE note_id = ?', (size, note_id))
+    return size
+
+
+def iter_note_file(conn, note_id):
+    """Yield a note's file contents in READ_SIZE pieces, in order.
+
+    The chunk list is read up front (ids only); each chunk is then opened
+    with blobopen and read incrementally.
+    """
+    chunk_ids = [row[0] for row in conn.execute(
+        'SELECT chunk_id FROM note_chunks WHERE note_id = ? ORDER BY seq', (note_id,)
+    )]
+    for chunk_id in chunk_ids:
+        with conn.blobopen('note_chunks', 'data', chunk_id, readonly=True) as blob:
+            for piece in iter(lambda: blob.read(READ_SIZE), b''):
+                yield piece
+
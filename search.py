@@ -0,0 +1,158 @@
+import html
+import re
+import sqlite3
+
+# Full-text indexes over the social database, kept in sync by triggers.
+# Each FTS table uses the source row id as its rowid, so keeping it in sync
+# and joining back are both primary key lookups.
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    content, author, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+    comment, author, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS folders_fts USING fts5(
+    folder_name, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts (rowid, content, author)
+    VALUES (new.id, new.content, (SELECT username FROM users WHERE id = new.user_id));
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF content, user_id ON posts BEGIN
+    UPDATE posts_fts
+    SET content = new.content, author = (SELECT username FROM users WHERE id = new.user_id)
+    WHERE rowid = new.id;
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+    DELETE FROM posts_fts WHERE rowid = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS comments_fts_insert AFTER INSERT ON comments BEGIN
+    INSERT INTO comments_fts (rowid, comment, author) VALUES (new.id, new.comment, new.username);
+END;
+CREATE TRIGGER IF NOT EXISTS comments_fts_update AFTER UPDATE OF comment, username ON comments BEGIN
+    UPDATE comments_fts SET comment = new.comment, author = new.username WHERE rowid = new.id;
+END;
+CREATE TRIGGER IF NOT EXISTS comments_fts_delete AFTER DELETE ON comments BEGIN
+    DELETE FROM comments_fts WHERE rowid = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS folders_fts_insert AFTER INSERT ON folders BEGIN
+    INSERT INTO folders_fts (rowid, folder_name) VALUES (new.id, new.folder_name);
+END;
+CREATE TRIGGER IF NOT EXISTS folders_fts_update AFTER UPDATE OF folder_name ON folders BEGIN
+    UPDATE folders_fts SET folder_name = new.folder_name WHERE rowid = new.id;
+END;
+CREATE TRIGGER IF NOT EXISTS folders_fts_delete AFTER DELETE ON folders BEGIN
+    DELETE FROM folders_fts WHERE rowid = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_fts_rename AFTER UPDATE OF username ON users BEGIN
+    UPDATE posts_fts SET author = new.username
+    WHERE rowid IN (SELECT id FROM posts WHERE user_id = new.id);
+END;
+"""
+
+# Backfill for existing rows; also run by the migration that adds the index
+REBUILD_SEARCH_INDEX = """
+DELETE FROM posts_fts;
+DELETE FROM comments_fts;
+DELETE FROM folders_fts;
+
+INSERT INTO posts_fts (rowid, content, author)
+SELECT posts.id, posts.content, users.username
+FROM posts LEFT JOIN users ON posts.user_id = users.id;
+INSERT INTO comments_fts (rowid, comment, author) SELECT id, comment, username FROM comments;
+INSERT INTO folders_fts (rowid, folder_name) SELECT id, folder_name FROM folders;
+
+INSERT INTO posts_fts (posts_fts) VALUES ('optimize');
+INSERT INTO comments_fts (comments_fts) VALUES ('optimize');
+INSERT INTO folders_fts (folders_fts) VALUES ('optimize');
+"""
+
+# Private-use markers so snippets can be HTML-escaped before highlighting
+_MARK_START = '\ue000'
+_MARK_END = '\ue001'
+
+
+def rebuild_search_index(db):
+    """Repopulate the FTS tables from posts, comments and folders"""
+    try:
+        db.executescript("BEGIN;" + REBUILD_SEARCH_INDEX + "COMMIT;")
+    except sqlite3.Error:
+        db.rollback()
+        raise
+
+
+def to_match_query(text, columns=None):
+    """Turn free text from a search box into an FTS5 MATCH expression.
+
+    Every word must match, and each is treated as a prefix so results show up
+    while the user is still typing. Returns None if there is nothing to search for.
+    """
+    words = re.findall(r'\w+', text or '')
+    if not words:
+        return None
+    query = ' '.join(f'"{word}"*' for word in words)
+    if columns:
+        query = '{%s} : (%s)' % (' '.join(columns), query)
+    return query
+
+
+def highlight(snippet):
+    """HTML-escape an FTS snippet and wrap the matched terms in <mark>"""
+    return (html.escape(snippet or '')
+            .replace(_MARK_START, '<mark>')
+            .replace(_MARK_END, '</mark>'))
+
+
+def search_posts(db, text, limit=20):
+    """Rank posts whose content or author match, best match first"""
+    match = to_match_query(text)
+    if not match:
+        return []
+    rows = db.execute("""
+        SELECT posts.id, users.username, posts.filename, posts.original_filename,
+               snippet(posts_fts, 0, ?, ?, '…', 16) AS snippet,
+               posts_fts.rank
+        FROM posts_fts
+        JOIN posts ON posts.id = posts_fts.rowid
+        JOIN users ON users.id = posts.user_id
+        WHERE posts_fts MATCH ?
+        ORDER BY posts_fts.rank
+        LIMIT ?
+    """, (_MARK_START, _MARK_END, match, limit)).fetchall()
+    return [{
+        'post_id': row['id'],
+        'username': row['username'],
+        'filename': row['filename'],
+        'original_filename': row['original_filename'],
+        'snippet': highlight(row['snippet']),
+        'rank': row['rank'],
+    } for row in rows]
+
+
+def search_comments(db, text, limit=20):
+    """Rank comments that match, best match first"""
+    match = to_match_query(text)
+    if not match:
+        return []
+    rows = db.execute("""
+        SELECT comments.id, comments.post_id, comments.username,
+               snippet(comments_fts, 0, ?, ?, '…', 16) AS snippet,
+               comments_fts.rank
+        FROM comments_fts
+        JOIN comments ON comments.id = comments_fts.rowid
+        WHERE comments_fts MATCH ?
+        ORDER BY comments_fts.rank
+        LIMIT ?
+    """, (_MARK_START, _MARK_END, match, limit)).fetchall()
+    return [{
+        'comment_id': row['id'],
+        'post_id': row['post_id'],
+        'username': row['username'],
+        'snippet': highlight(row['snippet']),
+        'rank': row['rank'],
+    } for row in rows]
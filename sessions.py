@@ -0,0 +1,188 @@
+"""Server-side session storage.
+
+The cookie only carries a random session id; the session data lives in the
+``sessions`` table (or in process memory for single-worker setups). Data
+is only written back when the session changed, or when more than half of
+its lifetime has passed so active users are not logged out. Logging in
+calls regenerate_session(), so a session id handed out before login is
+never the one that ends up authenticated.
+"""
+import secrets
+import time
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from cache import LRUCache
+from db import TRACKADEMIC_DB, ConnectionPool
+
+# How often the SQLite store sweeps out expired rows, in seconds
+CLEANUP_INTERVAL = 600
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session dict that remembers its id and whether it needs saving"""
+
+    def __init__(self, initial=None, sid=None, expires_at=None, new=False, stored=None):
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.new = new
+        self.modified = False
+        # Serialized data as loaded, so rewriting the same values is not a change
+        self.stored = stored
+        self.previous_sid = None
+
+    def regenerate(self):
+        """Move the data to a fresh session id; the old one is deleted when the session is saved"""
+        if not self.new and self.previous_sid is None:
+            self.previous_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.stored = None
+        self.modified = True
+
+
+class MemorySessionStore:
+    """Sessions kept in this process; only suitable for a single worker"""
+
+    def __init__(self, ttl, maxsize=10000):
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def load(self, sid):
+        return self._cache.get(sid)
+
+    def save(self, sid, data, expires_at):
+        self._cache.set(sid, (data, expires_at))
+
+    def delete(self, sid):
+        self._cache.pop(sid)
+
+
+class SqliteSessionStore:
+    """Sessions in the sessions table, shared by every worker.
+
+    The store has its own connection pool: saving a session commits, and
+    that must not commit (or roll back) whatever the route left open on
+    the request's connection.
+    """
+
+    def __init__(self, database=TRACKADEMIC_DB):
+        self.database = database
+        self._pool = ConnectionPool(database)
+        self._next_cleanup = 0
+
+    def load(self, sid):
+        conn = self._pool.acquire()
+        try:
+            row = conn.execute(
+                'SELECT data, expires_at FROM sessions WHERE sid = ? AND expires_at > ?',
+                (sid, time.time())
+            ).fetchone()
+        finally:
+            self._pool.release(conn)
+        return (row['data'], row['expires_at']) if row else None
+
+    def save(self, sid, data, expires_at):
+        conn = self._pool.acquire()
+        try:
+            conn.execute('''
+                INSERT INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(sid) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at
+            ''', (sid, data, expires_at))
+            now = time.time()
+            if now >= self._next_cleanup:
+                self._next_cleanup = now + CLEANUP_INTERVAL
+                conn.execute('DELETE FROM sessions WHERE expires_at <= ?', (now,))
+            conn.commit()
+        finally:
+            self._pool.release(conn)
+
+    def delete(self, sid):
+        conn = self._pool.acquire()
+        try:
+            conn.execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+            conn.commit()
+        finally:
+            self._pool.release(conn)
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Keep session data in a store and only the session id in the cookie"""
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            stored = self.store.load(sid)
+            if stored:
+                data, expires_at = stored
+                return ServerSideSession(self.serializer.loads(data), sid=sid, expires_at=expires_at, stored=data)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.previous_sid is not None:
+            self.store.delete(session.previous_sid)
+            session.previous_sid = None
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        now = time.time()
+        # Sliding expiry without a write on every request
+        refresh = session.expires_at is None or session.expires_at - now < lifetime / 2
+        if session.modified or session.stored is None:
+            data = self.serializer.dumps(dict(session))
+        else:
+            data = session.stored
+        if data == session.stored and not refresh:
+            return
+
+        session.expires_at = now + lifetime
+        self.store.save(session.sid, data, session.expires_at)
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add('Cookie')
+
+
+def regenerate_session(session):
+    """Give the session a new id on login, so an id planted before login is not reused.
+
+    Cookie-backed sessions are re-signed on every change and need nothing.
+    """
+    if isinstance(session, ServerSideSession):
+        session.regenerate()
+
+
+def init_app(app):
+    """Install the session backend named by SESSION_BACKEND (sqlite, memory or cookie)"""
+    backend = app.config.setdefault('SESSION_BACKEND', 'sqlite')
+    if backend == 'sqlite':
+        app.session_interface = ServerSideSessionInterface(SqliteSessionStore())
+    elif backend == 'memory':
+        ttl = app.permanent_session_lifetime.total_seconds()
+        app.session_interface = ServerSideSessionInterface(MemorySessionStore(ttl))
+    elif backend != 'cookie':
+        raise ValueError(f"Unknown session backend: {backend}")
@@ -0,0 +1,172 @@
+import json
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def page_size(requested, default=DEFAULT_PAGE_SIZE):
+    """Clamp a client-supplied page size to something sane"""
+    if not requested or requested < 1:
+        return default
+    return min(requested, MAX_PAGE_SIZE)
+
+
+# The dashboard feed; params are user_id, (match, match if searching), (before if paged), limit
+FEED_SELECT = """
+        SELECT
+            posts.id, posts.content, posts.filename, posts.original_filename, users.username, posts.user_id,
+            EXISTS(SELECT 1 FROM saved_posts WHERE post_id = posts.id AND user_id = ?) as is_saved
+        FROM posts
+        JOIN users ON posts.user_id = users.id
+    """
+
+# Posts whose text or author match, or that have a matching comment
+FEED_SEARCH = """(
+            posts.id IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?)
+            OR posts.id IN (
+                SELECT comments.post_id FROM comments
+                WHERE comments.id IN (SELECT rowid FROM comments_fts WHERE comments_fts MATCH ?)
+            )
+        )"""
+
+# A user's saved posts; params are user_id, (content match, match if searching), (before if paged), limit
+SAVED_POSTS_SELECT = """
+        SELECT f.folder_name, p.content, p.filename, p.original_filename, u.username, sp.id
+        FROM saved_posts sp
+        JOIN folders f ON sp.folder_id = f.id
+        JOIN posts p ON sp.post_id = p.id
+        JOIN users u ON p.user_id = u.id
+        WHERE sp.user_id = ?
+    """
+
+SAVED_POSTS_SEARCH = """ AND (
+            sp.post_id IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?)
+            OR sp.folder_id IN (SELECT rowid FROM folders_fts WHERE folders_fts MATCH ?)
+        )"""
+
+# json_each keeps this a single statement no matter how many posts are visible,
+# without running into SQLite's bound-parameter limit. Comments are never
+# edited, so id order is creation order and idx_comments_post_id needs no sort.
+COMMENTS_FOR_POSTS = """
+        SELECT post_id, id, username, comment, user_id
+        FROM comments
+        WHERE post_id IN (SELECT value FROM json_each(?))
+        ORDER BY post_id, id
+    """
+
+
+def feed_query(search=False, paged=False):
+    """SQL for one page of the feed, as run by load_feed() (and checked by check-query-plans)"""
+    conditions = []
+    if search:
+        conditions.append(FEED_SEARCH)
+    if paged:
+        conditions.append("posts.id < ?")
+    query = FEED_SELECT
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    # One extra row tells us whether another page exists
+    return query + " ORDER BY posts.id DESC LIMIT ?"
+
+
+def saved_posts_query(search=False, paged=False):
+    """SQL for one page of saved posts, as run by load_saved_posts()"""
+    query = SAVED_POSTS_SELECT
+    if search:
+        query += SAVED_POSTS_SEARCH
+    if paged:
+        query += " AND sp.id < ?"
+    return query + " ORDER BY sp.id DESC LIMIT ?"
+
+
+def load_feed(db, user_id, search_query='', before=None, limit=DEFAULT_PAGE_SIZE):
+    """Load one page of the dashboard feed for a user.
+
+    Pages are keyed on ``posts.id DESC``: pass the returned cursor back as
+    ``before`` to get the next page. Returns ``(posts, next_cursor)`` where
+    posts are ``(id, content, filename, original_filename, username,
+    user_id, is_saved, comments)`` tuples, the shape dashboard.html unpacks, and next_cursor is
+    None on the last page.
+    """
+    from search import to_match_query
+
+    params = [user_id]
+    match = to_match_query(search_query)
+    if match:
+        params += [match, match]
+    if before is not None:
+        params.append(before)
+    params.append(limit + 1)
+    posts = db.execute(feed_query(search=bool(match), paged=before is not None), params).fetchall()
+
+    posts, next_cursor = _split_page(posts, limit)
+    return attach_comments(db, posts), next_cursor
+
+
+def load_saved_posts(db, user_id, search_query='', before=None, limit=DEFAULT_PAGE_SIZE):
+    """Load one page of a user's saved posts, newest save first, grouped by folder.
+
+    Keyed on ``saved_posts.id DESC`` the same way as load_feed(). Returns
+    ``(organized, next_cursor)`` where organized maps folder name to the
+    saved posts in it.
+    """
+    from search import to_match_query
+
+    params = [user_id]
+    search = bool(to_match_query(search_query))
+    if search:
+        params.append(to_match_query(search_query, columns=['content']))
+        params.append(to_match_query(search_query))
+    if before is not None:
+        params.append(before)
+    params.append(limit + 1)
+    query = saved_posts_query(search=search, paged=before is not None)
+    rows, next_cursor = _split_page(db.execute(query, params).fetchall(), limit, cursor_column=5)
+
+    organized = {}
+    for folder, content, file, file_name, poster, sp_id in rows:
+        organized.setdefault(folder, []).append(
+            {'content': content, 'file': file, 'file_name': file_name, 'poster': poster, 'sp_id': sp_id})
+    return organized, next_cursor
+
+
+def attach_comments(db, posts):
+    """Fetch the comments for all given posts in one query and append them to each post tuple"""
+    if not posts:
+        return []
+
+    post_ids = [post[0] for post in posts]
+    comments_by_post = {post_id: [] for post_id in post_ids}
+
+    cursor = db.execute(COMMENTS_FOR_POSTS, (json.dumps(post_ids),))
+    for post_id, comment_id, username, comment, comment_user_id in cursor:
+        comments_by_post[post_id].append((comment_id, username, comment, comment_user_id))
+
+    return [(*post, comments_by_post[post[0]]) for post in posts]
+
+
+def feed_to_json(posts):
+    """Convert feed tuples from load_feed() into JSON-friendly dicts"""
+    return [{
+        'id': post_id,
+        'content': content,
+        'filename': filename,
+        'original_filename': original_filename,
+        'username': poster,
+        'user_id': post_user_id,
+        'is_saved': bool(is_saved),
+        'comments': [{
+            'id': comment_id,
+            'username': comment_username,
+            'comment': comment,
+            'user_id': comment_user_id,
+        } for comment_id, comment_username, comment, comment_user_id in comments],
+    } for post_id, content, filename, original_filename, poster, post_user_id, is_saved, comments in posts]
+
+
+def _split_page(rows, limit, cursor_column=0):
+    """Trim the look-ahead row and return the cursor for the next page, if any"""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1][cursor_column]
+    return rows, None
@@ -0,0 +1,202 @@
+"""Timetable time slots and weekly task completion state.
+
+Completions are stored per user, week and day in ``task_completions`` as a
+bitmap of half-hour slots: bit ``n`` is the task starting ``n * 30``
+minutes after midnight, so tasks must start on the hour or half hour.
+Toggling a task is a single upsert on the primary key, and a whole week
+is at most seven small integers.
+"""
+import datetime
+
+from cache import LRUCache
+
+SLOT_MINUTES = 30
+
+# Built timetable pages keyed by (user_id, week_start, weekday), each stored
+# with the WEEK_VERSION it was built at. Writes in this worker drop the user's
+# entries at once; other workers notice the version moved on their next read.
+# So a hit is one WEEK_VERSION read rather than none: a version kept only in
+# process would let a worker serve a page from before a write made elsewhere.
+WEEK_CACHE = LRUCache(maxsize=1024, ttl=300)
+
+# Per-user change counter for everything a timetable page shows, like
+# catalog_version for subjects: triggers bump it on any write to the user's
+# timetable rows or completions
+WEEK_VERSION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS timetable_version (
+    user_id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS timetable_version_insert AFTER INSERT ON timetable BEGIN
+    INSERT INTO timetable_version (user_id, version) VALUES (NEW.user_id, 1)
+    ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS timetable_version_update AFTER UPDATE ON timetable BEGIN
+    INSERT INTO timetable_version (user_id, version) VALUES (NEW.user_id, 1)
+    ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+    INSERT INTO timetable_version (user_id, version) SELECT OLD.user_id, 1 WHERE OLD.user_id IS NOT NEW.user_id
+    ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS timetable_version_delete AFTER DELETE ON timetable BEGIN
+    INSERT INTO timetable_version (user_id, version) VALUES (OLD.user_id, 1)
+    ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS completions_version_insert AFTER INSERT ON task_completions BEGIN
+    INSERT INTO timetable_version (user_id, version) VALUES (NEW.user_id, 1)
+    ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS completions_version_update AFTER UPDATE ON task_completions BEGIN
+    INSERT INTO timetable_version (user_id, version) VALUES (NEW.user_id, 1)
+    ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS completions_version_delete AFTER DELETE ON task_completions BEGIN
+    INSERT INTO timetable_version (user_id, version) VALUES (OLD.user_id, 1)
+    ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+"""
+
+# What a cached week is checked against: the user's counter and the subjects
+# catalog's (pages show subject names), two primary key lookups in one query
+WEEK_VERSION = """
+    SELECT t.version, c.version FROM catalog_version c
+    LEFT JOIN timetable_version t ON t.user_id = ?
+    WHERE c.name = 'subjects'
+"""
+
+# Flips the task's bit: (a | b) - (a & b) is XOR, which SQLite has no operator for
+TOGGLE_COMPLETION = '''
+    INSERT INTO task_completions (user_id, week_start, day, slots) VALUES (?, ?, ?, ?)
+    ON CONFLICT(user_id, week_start, day)
+    DO UPDATE SET slots = (slots | excluded.slots) - (slots & excluded.slots)
+'''
+
+# Join for schedule queries on timetable t; bind week_start()
+COMPLETIONS_JOIN = '''
+    LEFT JOIN task_completions c
+        ON c.user_id = t.user_id AND c.week_start = ? AND c.day = t.day
+'''
+
+# Select-list column that is 1 when the row's task is done this week; needs COMPLETIONS_JOIN
+COMPLETED_COLUMN = f"COALESCE((c.slots >> (t.start_minutes / {SLOT_MINUTES})) & 1, 0) AS completed"
+
+# A user's whole week with subject names and this week's completion flags; bind week_start(), user_id
+WEEK_QUERY = f"""
+    SELECT t.*, s.subject_name, s.subject_code, {COMPLETED_COLUMN}
+    FROM timetable t
+    JOIN subjects s ON t.subject_id = s.subject_id
+    {COMPLETIONS_JOIN}
+    WHERE t.user_id = ?
+    ORDER BY t.day, t.start_minutes
+"""
+
+# Any of the user's slots on that day that intersects [start, end); served by idx_timetable_user_day_start
+OVERLAPPING_SLOT = '''
+    SELECT time_slot FROM timetable
+    WHERE user_id = ? AND day = ? AND start_minutes < ? AND end_minutes > ?
+    LIMIT 1
+'''
+
+
+def time_to_minutes(time_str):
+    """Parse '9:30 AM' style times into minutes after midnight, or -1 if invalid"""
+    try:
+        time_str = time_str.strip().upper()
+
+        # Check if AM/PM is present
+        if " AM" in time_str:
+            time_part = time_str.replace(" AM", "")
+            is_pm = False
+        elif " PM" in time_str:
+            time_part = time_str.replace(" PM", "")
+            is_pm = True
+        else:
+            # Default to AM if no indicator
+            time_part = time_str
+            is_pm = False
+
+        # Handle case where time might have trailing spaces
+        time_part = time_part.strip()
+
+        if ":" in time_part:
+            hours_str, minutes_str = time_part.split(":")
+            hours = int(hours_str)
+            minutes = int(minutes_str)
+        else:
+            hours = int(time_part)
+            minutes = 0
+
+        # Convert 12-hour to 24-hour format
+        if is_pm:
+            if hours != 12:
+                hours += 12
+        else:
+            if hours == 12:
+                hours = 0
+
+        return hours * 60 + minutes
+    except Exception as e:
+        print(f"Error parsing time '{time_str}': {e}")
+        return -1  # Invalid time
+
+
+def minutes_to_time(minutes):
+    """Format minutes after midnight as a '9:30 AM' style time"""
+    hours, minutes = divmod(minutes, 60)
+    return f"{(hours - 1) % 12 + 1}:{minutes:02d} {'AM' if hours < 12 else 'PM'}"
+
+
+def parse_time_slot(time_slot):
+    """Split a '9:00 AM - 11:00 AM' slot into (start, end) minutes, None where unparseable"""
+    start, _, end = (time_slot or '').partition(' - ')
+    start_minutes, end_minutes = time_to_minutes(start), time_to_minutes(end)
+    return (start_minutes if start_minutes >= 0 else None,
+            end_minutes if end_minutes >= 0 else None)
+
+
+def starts_on_slot(time_str):
+    """True if a start time falls on a slot boundary (the hour or half hour)"""
+    minutes = time_to_minutes(time_str)
+    return minutes >= 0 and minutes % SLOT_MINUTES == 0
+
+
+def slot_bit(time_slot):
+    """Bit position of a '9:00 AM - 11:00 AM' slot in a day's completion bitmap"""
+    start_minutes = parse_time_slot(time_slot)[0]
+    if start_minutes is None:
+        raise ValueError(f"Invalid time slot: {time_slot!r}")
+    return start_minutes // SLOT_MINUTES
+
+
+def week_start(today=None):
+    """ISO date of the Monday of the current week"""
+    today = today or datetime.date.today()
+    return (today - datetime.timedelta(days=today.weekday())).isoformat()
+
+
+def toggle_completion(conn, user_id, day, time_slot):
+    """Flip a task between done and not done for this week"""
+    conn.execute(TOGGLE_COMPLETION, (user_id, week_start(), day, 1 << slot_bit(time_slot)))
+    conn.commit()
+    forget_week(user_id)
+
+
+def forget_week(user_id=None):
+    """Drop a user's cached timetable pages, or everyone's (e.g. after subject edits)"""
+    if user_id is None:
+        WEEK_CACHE.clear()
+    else:
+        WEEK_CACHE.remove_where(lambda key, value: key[0] == user_id)
+
+
+def clear_completion(conn, user_id, day=None, time_slot=None):
+    """Forget completion state for one removed slot, or for the user's whole timetable"""
+    if time_slot is None:
+        conn.execute('DELETE FROM task_completions WHERE user_id = ?', (user_id,))
+    elif parse_time_slot(time_slot)[0] is not None:
+        # A slot that never parsed never had a completion bit to clear
+        conn.execute(
+            'UPDATE task_completions SET slots = slots & ~? WHERE user_id = ? AND week_start = ? AND day = ?',
+            (1 << slot_bit(time_slot), user_id, week_start(), day)
+        )
@@ -0,0 +1,166 @@
+"""Small previews of uploaded images and PDFs, built off the request path.
+
+After an upload, schedule_thumbnail() queues a job on a local thread pool
+that writes ``thumbs/<sha256>.webp`` (or ``.jpg``) next to the blob:
+images are resized with Pillow, PDFs get their first page rendered by
+``pdftoppm`` (poppler-utils). Both tools are optional; without them no
+thumbnails are made. Pages call thumbnail_for() and use the original file
+until the thumbnail exists.
+"""
+import os
+import shutil
+import tempfile
+import threading
+from importlib.util import find_spec
+
+from flask import current_app
+
+from blobstore import THUMBNAIL_DIR, is_content_addressed
+
+# Pillow, subprocess and the thread pool are imported by the first thumbnail job
+HAVE_PILLOW = find_spec('PIL') is not None
+PDFTOPPM = shutil.which('pdftoppm')
+
+THUMBNAIL_SIZE = 640
+THUMBNAIL_QUALITY = 80
+PDF_TIMEOUT = 60
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+PDF_EXTENSIONS = ('.pdf',)
+
+_executor = None
+_workers = 0
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def _image_suffix():
+    from PIL import features
+
+    return '.webp' if features.check('webp') else '.jpg'
+
+
+def thumbnail_candidates(name):
+    """Thumbnail names a blob may have, relative to the upload folder"""
+    stem = os.path.splitext(name)[0]
+    return [f'{THUMBNAIL_DIR}/{stem}{suffix}' for suffix in ('.webp', '.jpg')]
+
+
+def thumbnail_for(name):
+    """Name of the blob's thumbnail if it has been built, else None"""
+    if not name or not is_content_addressed(name):
+        return None
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    for candidate in thumbnail_candidates(name):
+        if os.path.exists(os.path.join(upload_folder, candidate)):
+            return candidate
+    return None
+
+
+def can_thumbnail(name):
+    extension = os.path.splitext(name)[1]
+    if extension in IMAGE_EXTENSIONS:
+        return HAVE_PILLOW
+    if extension in PDF_EXTENSIONS:
+        return PDFTOPPM is not None
+    return False
+
+
+def schedule_thumbnail(upload_folder, name):
+    """Queue a thumbnail build for a blob; no-op if one is queued, exists or cannot be made"""
+    if not _workers or not name or not is_content_addressed(name) or not can_thumbnail(name):
+        return
+    with _pending_lock:
+        if name in _pending:
+            return
+        _pending.add(name)
+    _get_executor().submit(_build_thumbnail, upload_folder, name)
+
+
+def discard_thumbnails(upload_folder, name):
+    """Remove a deleted blob's thumbnails"""
+    for candidate in thumbnail_candidates(name):
+        path = os.path.join(upload_folder, candidate)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _build_thumbnail(upload_folder, name):
+    try:
+        source = os.path.join(upload_folder, name)
+        if not os.path.exists(source):
+            return
+        if any(os.path.exists(os.path.join(upload_folder, c)) for c in thumbnail_candidates(name)):
+            return
+        thumbs = os.path.join(upload_folder, THUMBNAIL_DIR)
+        os.makedirs(thumbs, exist_ok=True)
+        stem = os.path.splitext(name)[0]
+        if os.path.splitext(name)[1] in PDF_EXTENSIONS:
+            _render_pdf_page(source, thumbs, stem)
+        else:
+            _resize_image(source, thumbs, stem)
+    except Exception as e:
+        print(f"Error building thumbnail for {name}: {e}")
+    finally:
+        with _pending_lock:
+            _pending.discard(name)
+
+
+def _resize_image(source, thumbs, stem):
+    from PIL import Image, ImageOps
+
+    suffix = _image_suffix()
+    fd, temp_path = tempfile.mkstemp(dir=thumbs, prefix='.thumb-', suffix=suffix)
+    os.close(fd)
+    try:
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            if suffix == '.webp':
+                image.save(temp_path, 'WEBP', quality=THUMBNAIL_QUALITY)
+            else:
+                image.convert('RGB').save(temp_path, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+        # Small originals are better served as they are
+        if os.path.getsize(temp_path) >= os.path.getsize(source):
+            os.unlink(temp_path)
+            return
+        os.replace(temp_path, os.path.join(thumbs, stem + suffix))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def _render_pdf_page(source, thumbs, stem):
+    import subprocess
+
+    temp_dir = tempfile.mkdtemp(dir=thumbs, prefix='.thumb-')
+    try:
+        # -singlefile writes <prefix>.jpg for the first page only
+        subprocess.run(
+            [PDFTOPPM, '-f', '1', '-l', '1', '-singlefile', '-jpeg',
+             '-jpegopt', f'quality={THUMBNAIL_QUALITY}', '-scale-to', str(THUMBNAIL_SIZE),
+             source, os.path.join(temp_dir, 'page')],
+            check=True, capture_output=True, timeout=PDF_TIMEOUT,
+        )
+        os.replace(os.path.join(temp_dir, 'page.jpg'), os.path.join(thumbs, stem + '.jpg'))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _get_executor():
+    """The worker pool, started by the first upload rather than at worker start"""
+    global _executor
+    with _pending_lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _executor = ThreadPoolExecutor(max_workers=_workers, thread_name_prefix='thumbnail')
+        return _executor
+
+
+def init_app(app):
+    """Size the thumbnail workers (THUMBNAIL_WORKERS, 0 to disable) and expose thumbnail_for to templates"""
+    global _workers
+    _workers = app.config.setdefault('THUMBNAIL_WORKERS', 2)
+    app.jinja_env.globals['thumbnail_for'] = thumbnail_for